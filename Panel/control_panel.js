@@ -79,11 +79,11 @@ async function loadChannels() {
     list.innerHTML = '';
     data.channels.forEach(channel => {
       const li = document.createElement('li');
-      li.textContent = channel;
+      li.textContent = channel.name;
       const deleteButton = document.createElement('button');
       deleteButton.textContent = 'حذف';
       deleteButton.style.marginRight = '10px';
-      deleteButton.onclick = () => deleteChannel(channel);
+      deleteButton.onclick = () => deleteChannel(channel.id, channel.name);
       li.appendChild(deleteButton);
       list.appendChild(li);
     });
@@ -93,14 +93,14 @@ async function loadChannels() {
 }
 
 // حذف قناة
-async function deleteChannel(channelName) {
+async function deleteChannel(id, channelName) {
   if (!confirm(`متأكد أنك تريد حذف القناة: ${channelName} ؟`)) return;
 
   try {
     const response = await fetch('/api/channels/delete', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ channel: channelName })
+      body: JSON.stringify({ id })
     });
     const result = await response.json();
     if (result.success) {
@@ -204,30 +204,30 @@ async function loadSpecialReplies() {
     const list = document.getElementById('special-replies-list');
     list.innerHTML = '';
 
-    for (const username in data.special_mentions) {
+    data.special_replies.forEach(reply => {
       const li = document.createElement('li');
-      li.textContent = username;
+      li.textContent = reply.username;
       const deleteButton = document.createElement('button');
       deleteButton.textContent = 'حذف';
       deleteButton.style.marginRight = '10px';
-      deleteButton.onclick = () => deleteSpecialReply(username);
+      deleteButton.onclick = () => deleteSpecialReply(reply.id, reply.username);
       li.appendChild(deleteButton);
       list.appendChild(li);
-    }
+    });
   } catch (error) {
     console.error('فشل في تحميل الردود الخاصة:', error);
   }
 }
 
 // حذف ردود مستخدم كامل
-async function deleteSpecialReply(username) {
+async function deleteSpecialReply(id, username) {
   if (!confirm(`متأكد أنك تريد حذف الردود الخاصة بالمستخدم: ${username} ؟`)) return;
 
   try {
     const response = await fetch('/api/special_replies/delete', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ username })
+      body: JSON.stringify({ id })
     });
     const result = await response.json();
     if (result.success) {
@@ -256,6 +256,7 @@ async function addQuestion() {
   const answerText = document.getElementById('answer-text').value.trim();
   const alternativesText = document.getElementById('alternatives-text').value.trim();
   const questionType = document.getElementById('question-type').value.trim();
+  const maxTyposText = document.getElementById('max-typos').value.trim();
 
   if (!questionText || !answerText || !questionType) {
     alert('الرجاء تعبئة كل الحقول المطلوبة (سؤال، إجابة، نوع).');
@@ -270,7 +271,8 @@ async function addQuestion() {
     question: questionText,
     answer: answerText,
     alternatives,
-    type: questionType
+    type: questionType,
+    max_typos: maxTyposText === '' ? null : Number(maxTyposText)
   };
 
   try {
@@ -282,7 +284,13 @@ async function addQuestion() {
     const result = await response.json();
     if (result.success) {
       alert('تمت إضافة السؤال بنجاح!');
-      loadQuestions();
+      // نضيف السؤال الجديد للقائمة إذا كل الصفحات ظاهرة، بدل ما نعيد تحميلها
+      const filter = document.getElementById('questions-filter-type').value;
+      if (!questionsCursor && (!filter || filter === result.type)) {
+        document.getElementById('questions-list').appendChild(
+          renderQuestion({ id: result.id, question: questionText, answer: answerText, alternatives, type: result.type })
+        );
+      }
     } else {
       alert('خطأ أثناء إضافة السؤال!');
     }
@@ -292,43 +300,71 @@ async function addQuestion() {
   }
 }
 
-// تحميل جميع الأسئلة
+// الأسئلة تنعرض صفحات، والـ cursor هو id آخر سؤال ظاهر
+let questionsCursor = null;
+
+function renderQuestion(q) {
+  const li = document.createElement('li');
+  li.innerHTML = `<strong>س:</strong> ${q.question} <br> <strong>الإجابة:</strong> ${q.answer} <br> <strong>البدائل:</strong> ${q.alternatives.join(', ')} <br> <strong>النوع:</strong> ${q.type}`;
+  const deleteButton = document.createElement('button');
+  deleteButton.textContent = 'حذف';
+  deleteButton.style.marginTop = '5px';
+  deleteButton.onclick = () => deleteQuestion(q.id, li);
+  li.appendChild(deleteButton);
+  return li;
+}
+
+async function fetchQuestionsPage(cursor) {
+  const params = new URLSearchParams();
+  const type = document.getElementById('questions-filter-type').value;
+  if (type) params.set('type', type);
+  if (cursor) params.set('cursor', cursor);
+  // المتصفح يرسل If-None-Match بنفسه، وإذا ما تغير شي السيرفر يرد 304 ويستخدم الكاش
+  const response = await fetch(`/api/questions?${params}`);
+  return response.json();
+}
+
+function appendQuestions(data) {
+  const list = document.getElementById('questions-list');
+  data.questions.forEach(q => list.appendChild(renderQuestion(q)));
+  questionsCursor = data.next_cursor;
+  document.getElementById('questions-more').style.display = questionsCursor ? '' : 'none';
+}
+
+// تحميل أول صفحة من الأسئلة
 async function loadQuestions() {
   try {
-    const response = await fetch('/api/questions');
-    const data = await response.json();
-    const list = document.getElementById('questions-list');
-    list.innerHTML = '';
+    const data = await fetchQuestionsPage(null);
+    document.getElementById('questions-list').innerHTML = '';
+    appendQuestions(data);
+  } catch (error) {
+    console.error('فشل في تحميل الأسئلة:', error);
+  }
+}
 
-    data.forEach((q, index) => {
-      const li = document.createElement('li');
-      li.innerHTML = `<strong>س:</strong> ${q.question} <br> <strong>الإجابة:</strong> ${q.answer} <br> <strong>البدائل:</strong> ${q.alternatives.join(', ')} <br> <strong>النوع:</strong> ${q.type}`;
-      const deleteButton = document.createElement('button');
-      deleteButton.textContent = 'حذف';
-      deleteButton.style.marginTop = '5px';
-      deleteButton.onclick = () => deleteQuestion(index);
-      li.appendChild(deleteButton);
-      list.appendChild(li);
-    });
+async function loadMoreQuestions() {
+  if (!questionsCursor) return;
+  try {
+    appendQuestions(await fetchQuestionsPage(questionsCursor));
   } catch (error) {
     console.error('فشل في تحميل الأسئلة:', error);
   }
 }
 
 // حذف سؤال معين
-async function deleteQuestion(index) {
+async function deleteQuestion(id, li) {
   if (!confirm('متأكد أنك تريد حذف هذا السؤال؟')) return;
 
   try {
     const response = await fetch('/api/questions/delete', {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ index })
+      body: JSON.stringify({ id })
     });
     const result = await response.json();
     if (result.success) {
       alert('تم حذف السؤال بنجاح!');
-      loadQuestions();
+      li.remove();
     } else {
       alert('خطأ أثناء حذف السؤال.');
     }
@@ -1,33 +1,86 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
-import json
-import os
+import asyncio
+import hashlib
+import tempfile
+
+from bot.leaderboard import Leaderboard, GLOBAL
+from bot.question_store import QuestionStore, canonical_type
+from bot.question_io import EXPORTERS, FORMATS, import_questions
+from utils.config_feed import ConfigBroker, diff_keys
+from utils.json_store import JsonCollection, JsonStore
 
 app = FastAPI()
+# الردود الكبيرة (قوائم الأسئلة والتصدير) تنضغط إذا المتصفح يدعم gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 # تثبيت ملفات لوحة التحكم
 app.mount("/Panel", StaticFiles(directory="Panel"), name="panel")
 
+# ملفات data/*.json مشتركة بين كل الطلبات مع كاش وكتابة ذرية
+documents = JsonStore("data")
+settings_doc = documents.document("bot_settings.json", {})
+mention_replies_doc = documents.document("mention_responses.json", {"mention_general_responses": []})
+game_responses_doc = documents.document("game_responses.json", {})
+
+# القنوات والردود الخاصة لكل عنصر id ثابت، والملفات القديمة تتحول تلقائيًا
+channels = JsonCollection(
+    documents.document("channels.json", []),
+    key="name",
+    migrate=lambda names: ({"name": name} for name in names),
+)
+special_replies = JsonCollection(
+    documents.document("special_responses.json", {"special_mentions": {}}),
+    key="username",
+    migrate=lambda data: (
+        {"username": username, "replies": replies}
+        for username, replies in data.get("special_mentions", {}).items()
+    ),
+)
+
 # ---------------------------------------
-# قنوات
+# نشر التعديلات للبوت
 # ---------------------------------------
 
-CHANNELS_FILE = 'data/channels.json'
+config_broker = ConfigBroker()
+
+# كل ملف ينشر بشكل مسطح يفهمه البوت: {المفتاح: القيمة}. بس الملفات اللي البوت
+# يطبقها تنشر، وردود المنشن والطقطقة عند البوت من bot_settings.json نفسه
+CONFIG_VIEWS = {
+    "settings": (settings_doc, lambda data: data or {}),
+    "channels": (channels.document, lambda data: {"channels": [c["name"] for c in channels.items_of(data)]}),
+}
 
-def load_channels():
-    if not os.path.exists(CHANNELS_FILE):
-        return []
-    with open(CHANNELS_FILE, 'r', encoding='utf-8') as f:
-        return json.load(f)
+def _publisher(name, view):
+    def publish(old, new):
+        changes, removed = diff_keys(view(old), view(new))
+        config_broker.publish(name, changes, removed)
+    return publish
 
-def save_channels(channels):
-    with open(CHANNELS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(channels, f, ensure_ascii=False, indent=4)
+for _name, (_doc, _view) in CONFIG_VIEWS.items():
+    _doc.listeners.append(_publisher(_name, _view))
+
+async def config_snapshot():
+    return {name: view(await doc.read()) for name, (doc, view) in CONFIG_VIEWS.items()}
+
+@app.get("/api/events")
+async def config_events(request: Request):
+    # البوت يشترك هنا بدل ما يقرا الملفات كل شوي
+    return StreamingResponse(
+        config_broker.stream(request.headers.get("last-event-id"), config_snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ---------------------------------------
+# قنوات
+# ---------------------------------------
 
 @app.get("/api/channels")
 async def get_channels():
-    channels = load_channels()
-    return {"channels": channels}
+    return {"channels": await channels.all()}
 
 @app.post("/api/channels/add")
 async def add_channel(request: Request):
@@ -35,26 +88,41 @@ async def add_channel(request: Request):
     channel = data.get('channel')
     if not channel:
         return {"success": False, "error": "اسم القناة مفقود"}
-    channels = load_channels()
-    if channel in channels:
+    try:
+        channel_id = await channels.add({"name": channel})
+    except ValueError:
+        return {"success": False, "error": "القناة موجودة بالفعل"}
+    return {"success": True, "id": channel_id}
+
+@app.post("/api/channels/update")
+async def update_channel(request: Request):
+    data = await request.json()
+    channel_id = data.get('id')
+    channel = data.get('channel')
+    if channel_id is None or not channel:
+        return {"success": False, "error": "بيانات غير مكتملة"}
+    existing = await channels.id_of(channel)
+    if existing is not None and existing != channel_id:
         return {"success": False, "error": "القناة موجودة بالفعل"}
-    channels.append(channel)
-    save_channels(channels)
+    try:
+        await channels.update(channel_id, {"name": channel})
+    except KeyError:
+        return {"success": False, "error": "القناة غير موجودة"}
     return {"success": True}
 
 @app.post("/api/channels/delete")
 async def delete_channel(request: Request):
     data = await request.json()
-    channel = data.get('channel')
-    if not channel:
-        return {"success": False, "error": "اسم القناة مفقود"}
-    channels = load_channels()
-    if channel in channels:
-        channels.remove(channel)
-        save_channels(channels)
-        return {"success": True}
-    else:
+    channel_id = data.get('id')
+    if channel_id is None and data.get('channel'):
+        channel_id = await channels.id_of(data['channel'])
+    if channel_id is None:
+        return {"success": False, "error": "القناة غير موجودة"}
+    try:
+        await channels.delete(channel_id)
+    except KeyError:
         return {"success": False, "error": "القناة غير موجودة"}
+    return {"success": True}
 
 # ---------------------------------------
 # إعدادات المنشن
@@ -62,18 +130,16 @@ async def delete_channel(request: Request):
 
 @app.get("/api/settings")
 async def get_settings():
-    settings_path = 'data/bot_settings.json'
-    if not os.path.exists(settings_path):
-        return {}
-    with open(settings_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return await settings_doc.read()
 
 @app.post("/api/settings")
 async def save_settings(request: Request):
+    # اللوحة ترسل حقول المنشن بس، فالحفظ يدمجها مع الموجود بدل ما يمسح
+    # باقي الملف (مثل channel_settings)
     data = await request.json()
-    settings_path = 'data/bot_settings.json'
-    with open(settings_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    if not isinstance(data, dict):
+        return {"success": False, "error": "بيانات غير صالحة"}
+    await settings_doc.update(lambda current: current.update(data))
     return {"success": True}
 
 # ---------------------------------------
@@ -82,18 +148,12 @@ async def save_settings(request: Request):
 
 @app.get("/api/mention_replies")
 async def get_mention_replies():
-    replies_path = 'data/mention_responses.json'
-    if not os.path.exists(replies_path):
-        return {"mention_general_responses": []}
-    with open(replies_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return await mention_replies_doc.read()
 
 @app.post("/api/mention_replies")
 async def save_mention_replies(request: Request):
     data = await request.json()
-    replies_path = 'data/mention_responses.json'
-    with open(replies_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    await mention_replies_doc.write(data)
     return {"success": True}
 
 # ---------------------------------------
@@ -102,11 +162,7 @@ async def save_mention_replies(request: Request):
 
 @app.get("/api/special_replies")
 async def get_special_replies():
-    path = 'data/special_responses.json'
-    if not os.path.exists(path):
-        return {"special_mentions": {}}
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return {"special_replies": await special_replies.all()}
 
 @app.post("/api/special_replies/add")
 async def add_special_reply(request: Request):
@@ -116,109 +172,144 @@ async def add_special_reply(request: Request):
     if not username or not isinstance(replies, list):
         return {"success": False, "error": "بيانات غير مكتملة"}
 
-    path = 'data/special_responses.json'
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            special_data = json.load(f)
-    else:
-        special_data = {"special_mentions": {}}
-
-    special_data["special_mentions"][username] = replies
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(special_data, f, indent=4, ensure_ascii=False)
+    # نفس المستخدم مرة ثانية يحدث ردوده ويبقى بنفس الـ id
+    reply_id = await special_replies.add({"username": username, "replies": replies}, replace=True)
+    return {"success": True, "id": reply_id}
 
+@app.post("/api/special_replies/update")
+async def update_special_reply(request: Request):
+    data = await request.json()
+    reply_id = data.get('id')
+    replies = data.get('replies')
+    if reply_id is None or not isinstance(replies, list):
+        return {"success": False, "error": "بيانات غير مكتملة"}
+    try:
+        await special_replies.update(reply_id, {"replies": replies})
+    except KeyError:
+        return {"success": False, "error": "المستخدم غير موجود"}
     return {"success": True}
 
 @app.post("/api/special_replies/delete")
 async def delete_special_reply(request: Request):
     data = await request.json()
-    username = data.get('username')
-    if not username:
-        return {"success": False, "error": "اسم المستخدم مفقود"}
-
-    path = 'data/special_responses.json'
-    if not os.path.exists(path):
-        return {"success": False, "error": "لا توجد ردود خاصة"}
-
-    with open(path, 'r', encoding='utf-8') as f:
-        special_data = json.load(f)
-
-    if username in special_data.get("special_mentions", {}):
-        del special_data["special_mentions"][username]
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(special_data, f, indent=4, ensure_ascii=False)
-        return {"success": True}
-    else:
+    reply_id = data.get('id')
+    if reply_id is None and data.get('username'):
+        reply_id = await special_replies.id_of(data['username'])
+    if reply_id is None:
         return {"success": False, "error": "المستخدم غير موجود"}
+    try:
+        await special_replies.delete(reply_id)
+    except KeyError:
+        return {"success": False, "error": "المستخدم غير موجود"}
+    return {"success": True}
 
 # ---------------------------------------
 # إدارة الأسئلة
 # ---------------------------------------
 
+question_store = QuestionStore()
+
+QUESTIONS_PAGE = 50
+QUESTIONS_MAX_PAGE = 500
+
 @app.get("/api/questions")
-async def get_questions():
-    path = 'data/questions_bank.json'
-    if not os.path.exists(path):
-        return []
-    with open(path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+async def get_questions(request: Request, response: Response, limit: int = QUESTIONS_PAGE,
+                        cursor: int = None, type: str = None, category: str = None):
+    limit = max(1, min(limit, QUESTIONS_MAX_PAGE))
+    # الـ ETag من نسخة البنك والفلاتر، فإذا ما تغير شي نرجع 304 بدون ما نقرا الأسئلة
+    version = await asyncio.to_thread(question_store.version)
+    query = hashlib.sha1(f"{limit}|{cursor}|{type}|{category}".encode("utf-8")).hexdigest()[:12]
+    etag = f'W/"q{version}-{query}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    questions, next_cursor = await asyncio.to_thread(question_store.page, limit, cursor, type, category)
+    response.headers.update(headers)
+    return {"questions": questions, "next_cursor": next_cursor, "version": version}
+
+@app.get("/api/questions/stats")
+async def get_question_stats():
+    # الأعداد من جدول question_counts، بدون ما نعد البنك
+    version, counts = await asyncio.to_thread(question_store.state)
+    return {"version": version, "counts": counts, "total": sum(counts.values())}
 
 @app.post("/api/questions/add")
 async def add_question(request: Request):
     data = await request.json()
-    required_fields = ["question", "answer", "alternatives", "type"]
+    required_fields = ["question", "answer", "type"]
     if not all(field in data for field in required_fields):
         return {"success": False, "error": "بيانات السؤال ناقصة"}
 
-    path = 'data/questions_bank.json'
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
-    else:
-        questions = []
+    try:
+        qid = await asyncio.to_thread(question_store.add, data)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    return {"success": True, "id": qid, "type": canonical_type(data.get("type"))}
 
-    questions.append(data)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(questions, f, indent=4, ensure_ascii=False)
+@app.post("/api/questions/update")
+async def update_question(request: Request):
+    data = await request.json()
+    qid = data.get('id')
+    if qid is None:
+        return {"success": False, "error": "رقم السؤال مفقود"}
 
+    try:
+        found = await asyncio.to_thread(question_store.update, qid, data)
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+
+    if not found:
+        return {"success": False, "error": "رقم السؤال غير صالح"}
     return {"success": True}
 
 @app.post("/api/questions/delete")
 async def delete_question(request: Request):
+    # الحذف بالـ id بس: رقم السؤال في القائمة يتغير لو فيه أكثر من تبويب يعدل
     data = await request.json()
-    index = data.get('index')
-
-    if index is None:
+    qid = data.get('id')
+    if qid is None:
         return {"success": False, "error": "رقم السؤال مفقود"}
 
-    path = 'data/questions_bank.json'
-    if not os.path.exists(path):
-        return {"success": False, "error": "لا توجد أسئلة"}
-
-    with open(path, 'r', encoding='utf-8') as f:
-        questions = json.load(f)
-
-    if 0 <= index < len(questions):
-        del questions[index]
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, indent=4, ensure_ascii=False)
+    if await asyncio.to_thread(question_store.delete, qid):
         return {"success": True}
     else:
         return {"success": False, "error": "رقم السؤال غير صالح"}
 
+@app.post("/api/questions/import")
+async def import_questions_file(request: Request, format: str = "jsonl"):
+    # الملف ينرسل كـ body خام، وينحفظ مؤقتًا (بالذاكرة لين 1MB وبعدها على القرص)
+    if format not in FORMATS:
+        return {"success": False, "error": "صيغة غير مدعومة"}
+
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as upload:
+        async for chunk in request.stream():
+            upload.write(chunk)
+        upload.seek(0)
+        report = await asyncio.to_thread(import_questions, question_store, upload, format)
+
+    return {"success": report["failed"] == 0, **report}
+
+@app.get("/api/questions/export")
+async def export_questions(format: str = "jsonl", type: str = None):
+    if format not in FORMATS:
+        return {"success": False, "error": "صيغة غير مدعومة"}
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        EXPORTERS[format](question_store.iter_all(type)),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f'attachment; filename="questions.{format}"'},
+    )
+
 # ---------------------------------------
 # ردود اللعبة والطقطقة
 # ---------------------------------------
 
 @app.get("/api/game_responses/get")
 async def get_game_responses(type: str):
-    path = 'data/game_responses.json'
-    if not os.path.exists(path):
-        return {"responses": []}
-
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
+    data = await game_responses_doc.read()
     responses = data.get(type, [])
     return {"responses": responses}
 
@@ -231,15 +322,27 @@ async def save_game_responses(request: Request):
     if not type_ or not isinstance(responses, list):
         return {"success": False, "error": "بيانات غير مكتملة"}
 
-    path = 'data/game_responses.json'
-    if os.path.exists(path):
-        with open(path, 'r', encoding='utf-8') as f:
-            current_data = json.load(f)
-    else:
-        current_data = {}
-
-    current_data[type_] = responses
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(current_data, f, indent=4, ensure_ascii=False)
+    def save(current_data):
+        current_data[type_] = responses
 
+    await game_responses_doc.update(save)
     return {"success": True}
+
+# ---------------------------------------
+# الترتيب
+# ---------------------------------------
+
+leaderboard = Leaderboard()
+
+@app.get("/api/leaderboard")
+async def get_leaderboard(channel: str = GLOBAL, limit: int = 10, player: str = None):
+    channel = channel.lower()
+    limit = max(1, min(limit, 100))
+    leaders = await asyncio.to_thread(leaderboard.fetch_top, channel, limit)
+    result = {
+        "channel": channel,
+        "leaders": [{"rank": i, "player": p, "points": pts} for i, (p, pts) in enumerate(leaders, 1)],
+    }
+    if player:
+        result["player"] = await asyncio.to_thread(leaderboard.fetch_rank, channel, player.lower())
+    return result
@@ -1,16 +1,26 @@
 
 from flask import Flask, request, render_template, redirect, url_for
-import json
-import os
+import asyncio
+import threading
 
-from bot.settings import BotSettings
+from utils.json_store import JsonStore
 
 app = Flask(__name__)
-settings = BotSettings()
+
+# نفس ملف الإعدادات اللي يستخدمه سيرفر اللوحة: قراءة من الكاش وتعديل ذري تحت قفل
+documents = JsonStore("data")
+settings_doc = documents.document("bot_settings.json", {})
+# Flask يخدم كل طلب في thread، وكل استدعاء له event loop خاص فيه، فيمشون وحدة وحدة
+_doc_lock = threading.Lock()
+
+def run_document(coro):
+    with _doc_lock:
+        return asyncio.run(coro)
 
 @app.route('/channel/<channel_name>')
 def channel_settings(channel_name):
-    channel_settings = settings.get_setting(channel_name)
+    settings = run_document(settings_doc.read())
+    channel_settings = (settings.get("channel_settings") or {}).get(channel_name)
     return render_template('channel_settings.html', channel_name=channel_name, channel_settings=channel_settings)
 
 @app.route('/update-channel-settings/<channel_name>', methods=['POST'])
@@ -27,7 +37,11 @@ def update_channel_settings(channel_name):
         "warning_message": warning_message,
         "timeout_message": timeout_message
     }
-    settings.update_setting(channel_name, channel_settings)
+    # كل القنوات تحت channel_settings، والبوت يطبقها فوق الإعدادات العامة
+    def save(settings):
+        settings.setdefault("channel_settings", {})[channel_name] = channel_settings
+
+    run_document(settings_doc.update(save))
     return redirect(url_for('channel_settings', channel_name=channel_name))
 
 if __name__ == '__main__':
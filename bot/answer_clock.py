@@ -0,0 +1,79 @@
+import time
+
+
+def server_time(msg):
+    """
+    وقت إرسال الرسالة حسب سيرفر تويتش (tag tmi-sent-ts بالملي ثانية)، أو None إذا مو موجود.
+    """
+    tags = getattr(msg, "tags", None) or {}
+    sent = tags.get("tmi-sent-ts")
+    try:
+        return int(sent) / 1000
+    except (TypeError, ValueError):
+        return None
+
+
+class DriftStats:
+    """
+    الفرق بين وقت معالجة الرسالة عندنا ووقت إرسالها حسب السيرفر، لكل لعبة.
+    الفرق = فرق الساعتين + زمن الوصول + تأخير المعالجة، فإذا طلع بالسالب معناها
+    ساعتنا متأخرة عن السيرفر أكثر منه أكيد. التأخير يكبر الفرق بس، فما يقدر يطلع
+    تصحيح غلط من هنا.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.min = None
+        self.fallbacks = 0
+
+    def record(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+
+    @property
+    def offset(self):
+        # كم ساعتنا متأخرة عن السيرفر أكيد (صفر أو سالب)
+        return min(0.0, self.min) if self.min is not None else 0.0
+
+    def summary(self):
+        return {
+            "messages": self.count,
+            "fallbacks": self.fallbacks,
+            "mean_ms": round(self.total / self.count * 1000, 1) if self.count else None,
+            "max_ms": round(self.max * 1000, 1) if self.count else None,
+            "offset_ms": round(self.offset * 1000, 1) if self.count else None,
+        }
+
+
+class AnswerClock:
+    """
+    يحسب سرعة الإجابة من لحظة إرسال السؤال لين لحظة إرسال اللاعب لرسالته حسب السيرفر،
+    عشان تأخير معالجتنا ما يحسب على اللاعب. إذا ساعة الجهاز متأخرة عن السيرفر (حسب
+    أسئلة اللعبة اللي قبل) وقت إرسال السؤال يتصحح بالفرق، والتصحيح ثابت طول السؤال.
+    الساعة المقدمة ما تنعرف من تأخير المعالجة فما تتصحح، والجهاز لازم يكون متزامن (NTP).
+    إذا الرسالة ما فيها وقت السيرفر نرجع للساعة المحلية.
+    """
+
+    def __init__(self, drift=None):
+        # لازم تنشأ مباشرة بعد إرسال السؤال
+        self.sent_wall = time.time()
+        self.sent_mono = time.monotonic()
+        self.drift = drift if drift is not None else DriftStats()
+        self.offset = self.drift.offset
+
+    def elapsed(self, msg):
+        sent = server_time(msg)
+        if sent is None:
+            self.drift.fallbacks += 1
+            return time.monotonic() - self.sent_mono
+        self.drift.record(time.time() - sent)
+        return max(0.0, sent - (self.sent_wall - self.offset))
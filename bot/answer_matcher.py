@@ -0,0 +1,169 @@
+import re
+
+# التشكيل والتطويل يُحذف، وأشكال الهمزة والألف والياء والتاء المربوطة تتوحد
+_DIACRITICS = (
+    [chr(c) for c in range(0x0610, 0x061B)]
+    + [chr(c) for c in range(0x064B, 0x0660)]
+    + ["ٰ", "ـ"]
+    + [chr(c) for c in range(0x06D6, 0x06EE)]
+)
+
+_LETTERS = {
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ى": "ي",
+    "ة": "ه",
+}
+
+_TABLE = str.maketrans({**{c: None for c in _DIACRITICS}, **_LETTERS})
+_TABLE.update(str.maketrans("٠١٢٣٤٥٦٧٨٩۰۱۲۳۴۵۶۷۸۹", "01234567890123456789"))
+
+_SPACES = re.compile(r"\s+")
+
+# عدد الأخطاء الإملائية المسموحة افتراضيًا لكل نوع سؤال (0 = مطابقة تامة)
+DEFAULT_MAX_TYPOS = {
+    "Normal": 1,
+    "Steal": 1,
+    "Sabotage": 1,
+    "Fate": 1,
+    "Golden": 0,
+    "Doom": 0,
+}
+
+# الإجابات القصيرة جدًا ما نسمح فيها بأخطاء (مثلاً "١٢" و "١٣")
+FUZZY_MIN_LENGTH = 4
+
+
+def max_typos_for(entry, qtype=None):
+    """
+    عدد الأخطاء المسموح لسؤال من البنك: max_typos في السؤال نفسه، وإذا مو موجود
+    الافتراضي لنوع السؤال.
+    """
+    max_typos = entry.get("max_typos")
+    if max_typos is None:
+        max_typos = DEFAULT_MAX_TYPOS.get(qtype or entry.get("type"), 0)
+    return max_typos
+
+
+def normalize_answer(text):
+    """
+    يوحد شكل الإجابة قبل المقارنة: حروف صغيرة، بدون تشكيل أو تطويل،
+    همزات وياءات وتاء مربوطة موحدة، ومسافات مضغوطة.
+    """
+    if not text:
+        return ""
+    text = text.casefold().translate(_TABLE)
+    return _SPACES.sub(" ", text).strip()
+
+
+def bounded_distance(a, b, limit):
+    """
+    مسافة Levenshtein بين a و b، وإذا تعدت limit يرجع limit + 1 ويوقف الحساب بدري.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, cb in enumerate(b, 1):
+        current = [i]
+        row_min = i
+        for j, ca in enumerate(a, 1):
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            current.append(value)
+            if value < row_min:
+                row_min = value
+        if row_min > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+
+class _BKTree:
+    """
+    شجرة BK على الإجابات الموحدة، عشان البحث عن أقرب إجابة ما يمر على كل الإجابات.
+    كل عقدة: (الكلمة، {المسافة: العقدة الابن}).
+    """
+
+    __slots__ = ("root", "lengths")
+
+    def __init__(self, words):
+        self.root = None
+        self.lengths = set()
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        self.lengths.add(len(word))
+        if self.root is None:
+            self.root = (word, {})
+            return
+        node = self.root
+        while True:
+            distance = bounded_distance(word, node[0], len(word) + len(node[0]))
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                return
+            node = child
+
+    def within(self, word, k):
+        if self.root is None:
+            return False
+        size = len(word)
+        if not any(abs(size - length) <= k for length in self.lengths):
+            return False
+        stack = [self.root]
+        while stack:
+            candidate, children = stack.pop()
+            # نحسب المسافة بس لين الحد اللي يكفي نقرر أي أبناء نزورهم
+            limit = k + max(children, default=0)
+            distance = bounded_distance(word, candidate, limit)
+            if distance <= k:
+                return True
+            for key, child in children.items():
+                if distance - k <= key <= distance + k:
+                    stack.append(child)
+        return False
+
+
+class AnswerMatcher:
+    """
+    يتجهز مرة وحدة لكل سؤال، وبعدها كل رسالة تتوحد مرة وحدة وتنفحص بـ lookup واحد.
+    إذا max_typos أكبر من صفر، الإجابة القريبة (بعدد أخطاء محدود) تنقبل كمان.
+    """
+
+    __slots__ = ("answers", "max_typos", "_fuzzy")
+
+    def __init__(self, correct_answer, alt_answers=None, max_typos=0):
+        forms = (normalize_answer(a) for a in [correct_answer, *(alt_answers or [])])
+        self.answers = frozenset(f for f in forms if f)
+        self.max_typos = max(0, int(max_typos or 0))
+        self._fuzzy = None
+        if self.max_typos:
+            self._fuzzy = _BKTree(a for a in self.answers if len(a) >= FUZZY_MIN_LENGTH)
+
+    @classmethod
+    def from_entry(cls, entry, qtype=None):
+        """
+        يبني الماتشر من سؤال في بنك الأسئلة، وعدد الأخطاء من max_typos_for.
+        """
+        answer = entry.get("answer", entry.get("correct_answer", ""))
+        alt_answers = entry.get("alt_answers", entry.get("alternatives")) or []
+        return cls(answer, alt_answers, max_typos_for(entry, qtype))
+
+    def matches(self, text):
+        response = normalize_answer(text)
+        if response in self.answers:
+            return True
+        if self._fuzzy is None or len(response) < FUZZY_MIN_LENGTH:
+            return False
+        return self._fuzzy.within(response, self.max_typos)
+
+    __contains__ = matches
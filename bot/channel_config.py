@@ -0,0 +1,73 @@
+from types import MappingProxyType
+
+from settings_manager import current_settings
+
+# إعدادات القناة في لوحة القنوات بأسماء غير أسماء الإعدادات العامة
+CHANNEL_KEY_ALIASES = {
+    "timeout_duration": "mention_guard_duration",
+    "warning_message": "mention_guard_warn_msg",
+    "timeout_message": "mention_guard_timeout_msg",
+    "cooldown_period": "mention_guard_cooldown",
+    "warning_threshold": "mention_guard_warning_thresh",
+}
+
+
+def normalize_overrides(overrides):
+    # القيم الفاضية من الفورم ما تغطي على الإعداد العام
+    if not isinstance(overrides, dict):
+        return {}
+    return {
+        CHANNEL_KEY_ALIASES.get(key, key): value
+        for key, value in overrides.items()
+        if value is not None and value != ""
+    }
+
+
+class ChannelConfigResolver:
+    """
+    الإعدادات الفعلية لكل قناة بطبقتين: العامة، وفوقها إعدادات القناة (channel_settings
+    في bot_settings.json). النتيجة لكل قناة محسوبة مرة وحدة ومحفوظة، ولما الإعدادات
+    تتغير ينمسح كاش القنوات اللي تأثرت بس.
+    """
+
+    def __init__(self, settings=current_settings):
+        self.settings = settings
+        self._version = None
+        self._global = {}
+        self._channels = {}
+        self._resolved = {}
+
+    def _refresh(self, snapshot):
+        channel_settings = snapshot.get("channel_settings") or {}
+        global_config = {k: v for k, v in snapshot.data.items() if k != "channel_settings"}
+        channels = {}
+        for channel, overrides in channel_settings.items():
+            channels[channel.lower()] = normalize_overrides(overrides)
+
+        if global_config != self._global:
+            self._resolved.clear()
+        else:
+            for channel in set(channels) | set(self._channels):
+                if channels.get(channel) != self._channels.get(channel):
+                    self._resolved.pop(channel, None)
+
+        self._global = global_config
+        self._channels = channels
+        self._version = snapshot.version
+
+    def get(self, channel):
+        channel = channel.lower()
+        snapshot = self.settings()
+        if snapshot.version != self._version:
+            self._refresh(snapshot)
+        resolved = self._resolved.get(channel)
+        if resolved is None:
+            config = dict(self._global)
+            config.update(self._channels.get(channel, {}))
+            resolved = MappingProxyType(config)
+            self._resolved[channel] = resolved
+        return resolved
+
+    def forget(self, channel):
+        # القناة طلعت: نمسح الكاش حقها
+        self._resolved.pop(channel.lower(), None)
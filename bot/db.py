@@ -0,0 +1,62 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = "widux_panel.db"
+# أقصى حجم من الملف يتقرا بـ mmap
+MMAP_SIZE = 256 * 1024 * 1024
+
+
+def connect(db_path=DB_PATH):
+    """
+    اتصال SQLite مشترك بين البوت وسيرفر اللوحة: WAL عشان القراءة ما تنتظر الكتابة،
+    و busy_timeout عشان أكثر من عملية تقدر تكتب بنفس الملف. القراءة عن طريق mmap،
+    فكل العمليات (البوت والشاردات واللوحة) تتشارك نفس صفحات الملف من page cache
+    بدل ما كل وحدة تنسخها في ذاكرتها.
+    """
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+    return conn
+
+
+# ملف القاعدة -> (الاتصال، القفل)، اتصال واحد لكل ملف في العملية
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def _shared_connection(db_path):
+    key = os.path.abspath(db_path)
+    with _shared_lock:
+        if key not in _shared:
+            # RLock لأن جدول ممكن يقرا من جدول ثاني وهو ماسك القفل (الأكياس من البنك)
+            _shared[key] = (connect(db_path), threading.RLock())
+        return _shared[key]
+
+
+class Database:
+    """
+    جداول كلاس واحد في ملف القاعدة: الاتصال مشترك مع باقي الكلاسات اللي على نفس
+    الملف ويفتح أول ما ينطلب، و schema و setup(conn) يتنفذون مرة وحدة قبل أول استخدام.
+    كل transaction لازم تخلص داخل session() عشان القفل يغطيها.
+    """
+
+    def __init__(self, db_path=DB_PATH, schema="", setup=None):
+        self.db_path = db_path
+        self.schema = schema
+        self.setup = setup
+        self._ready = False
+
+    @contextmanager
+    def session(self):
+        conn, lock = _shared_connection(self.db_path)
+        with lock:
+            if not self._ready:
+                if self.schema:
+                    conn.executescript(self.schema)
+                if self.setup is not None:
+                    self.setup(conn)
+                self._ready = True
+            yield conn
@@ -0,0 +1,107 @@
+from collections import Counter
+
+from bot.answer_matcher import max_typos_for
+from bot.questions.normal import TeamNormalQuestion
+from bot.questions.golden import GoldenQuestion
+from bot.questions.sabotage import SabotageQuestion
+from bot.questions.doom import DoomQuestion
+from bot.questions.fate import TestOfFate
+from bot.questions.steal_or_boost import ChallengeStealOrBoostQuestion, StealOrBoostTeamQuestion
+
+# عدد أسئلة جولة اختبار المصير
+FATE_QUESTIONS = 5
+
+# نوع السؤال في البنك لكل مرحلة
+PHASE_BANK_TYPES = {
+    "normal": "Normal",
+    "golden": "Golden",
+    "steal_or_boost": "Steal",
+    "sabotage": "Sabotage",
+    "fate": "Fate",
+    "doom": "Doom",
+}
+
+
+class PlanError(Exception):
+    """البنك ما فيه أسئلة كافية لأنواع اللعبة المطلوبة."""
+
+    def __init__(self, missing):
+        self.missing = missing
+        details = "، ".join(f"{qtype} ({have}/{need})" for qtype, (have, need) in missing.items())
+        super().__init__(f"ما فيه أسئلة كافية في البنك: {details}")
+
+
+def phase_types(game_mode, normal_count):
+    phases = ["normal"] * normal_count + ["golden", "steal_or_boost"]
+    if game_mode == "تيم":
+        phases.append("sabotage")
+    phases += ["fate", "doom"]
+    return phases
+
+
+def plan_needs(phases):
+    needs = Counter()
+    for phase in phases:
+        needs[PHASE_BANK_TYPES[phase]] += FATE_QUESTIONS if phase == "fate" else 1
+    return dict(needs)
+
+
+def _build(cls, entry, qtype):
+    # نفس قاعدة الأخطاء المسموحة اللي يستخدمها AnswerMatcher.from_entry
+    return cls(entry["question"], entry["answer"], entry.get("alternatives"), max_typos_for(entry, qtype))
+
+
+def build_question(phase, entries, game_mode):
+    qtype = PHASE_BANK_TYPES[phase]
+    if phase == "fate":
+        return TestOfFate([entries.pop(0) for _ in range(FATE_QUESTIONS)])
+    if phase == "steal_or_boost":
+        cls = StealOrBoostTeamQuestion if game_mode == "تيم" else ChallengeStealOrBoostQuestion
+    else:
+        cls = {
+            "normal": TeamNormalQuestion,
+            "golden": GoldenQuestion,
+            "sabotage": SabotageQuestion,
+            "doom": DoomQuestion,
+        }[phase]
+    return _build(cls, entries.pop(0), qtype)
+
+
+async def compile_plan(bank, channel, game_mode, normal_count):
+    """
+    يجهز كل مراحل اللعبة مرة وحدة في بدايتها: يسحب كل الأسئلة اللي تحتاجها
+    من كيس القناة بطلب واحد ويبني منها أسئلة جاهزة بالماتشر حقها، فما فيه أي
+    قراءة من البنك بين المراحل. إذا نوع ناقص يرفع PlanError قبل ما تبدأ اللعبة.
+    """
+    phases = phase_types(game_mode, normal_count)
+    needs = plan_needs(phases)
+    # الأعداد أول، عشان البنك الناقص ما يسحب من أكياس القناة على الفاضي
+    counts = await bank.type_counts()
+    short = {
+        qtype: (counts.get(qtype, 0), need)
+        for qtype, need in needs.items()
+        if counts.get(qtype, 0) < need
+    }
+    if short:
+        raise PlanError(short)
+    resolved = await bank.draw_many(channel, needs)
+
+    missing = {
+        qtype: (len(resolved.get(qtype, [])), need)
+        for qtype, need in needs.items()
+        if len(resolved.get(qtype, [])) < need
+    }
+    if missing:
+        raise PlanError(missing)
+
+    pools = {qtype: list(entries) for qtype, entries in resolved.items()}
+    plan = []
+    for phase in phases:
+        pool = pools[PHASE_BANK_TYPES[phase]]
+        used = pool[:FATE_QUESTIONS if phase == "fate" else 1]
+        plan.append({
+            "type": phase,
+            "question": build_question(phase, pool, game_mode),
+            "ids": tuple(entry["id"] for entry in used),
+        })
+    return plan
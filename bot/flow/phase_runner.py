@@ -0,0 +1,123 @@
+import asyncio
+import time
+
+# حالات تشغيل خطة اللعبة
+IDLE = "idle"
+RUNNING = "running"
+PAUSED = "paused"
+FINISHED = "finished"
+CANCELLED = "cancelled"
+
+# الاستراحة بين كل سؤال والثاني
+PHASE_GAP = 2
+
+# أقصى مدة لكل مرحلة، بعدها تنقطع المرحلة وننتقل للي بعدها
+PHASE_TIMEOUTS = {
+    "normal": 30,
+    "golden": 30,
+    "steal_or_boost": 60,
+    "sabotage": 60,
+    "fate": 90,
+    "doom": 60,
+}
+DEFAULT_PHASE_TIMEOUT = 60
+
+
+class PhaseRunner:
+    """
+    يشغل مراحل خطة اللعبة وحدة ورا الثانية في حلقة وحدة (بدون استدعاء ذاتي)،
+    ويعرض المرحلة الحالية وموعد نهايتها، ويقبل الإيقاف المؤقت والإلغاء.
+    """
+
+    def __init__(self, plan, run_phase, on_error=None, on_timeout=None, gap=PHASE_GAP):
+        self.plan = plan
+        self.run_phase = run_phase
+        self.on_error = on_error
+        self.on_timeout = on_timeout
+        self.gap = gap
+        self.index = 0
+        self.state = IDLE
+        self.current_phase = None
+        self.deadline = None
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._task = None
+
+    @property
+    def remaining(self):
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def snapshot(self):
+        return {
+            "state": self.state,
+            "index": self.index,
+            "total": len(self.plan),
+            "phase": self.current_phase["type"] if self.current_phase else None,
+            "remaining": self.remaining,
+        }
+
+    async def run(self):
+        self.state = RUNNING
+        self._task = asyncio.current_task()
+        try:
+            while self.index < len(self.plan):
+                if not self._resume.is_set():
+                    self.state = PAUSED
+                    await self._resume.wait()
+                if self.state == CANCELLED:
+                    return self.state
+                self.state = RUNNING
+
+                phase = self.plan[self.index]
+                self.index += 1
+                await self._run_one(phase)
+
+                self.current_phase = None
+                if self.index < len(self.plan):
+                    self.deadline = time.monotonic() + self.gap
+                    await asyncio.sleep(self.gap)
+            if self.state != CANCELLED:
+                self.state = FINISHED
+        except asyncio.CancelledError:
+            self.state = CANCELLED
+            raise
+        finally:
+            self.current_phase = None
+            self.deadline = None
+            self._task = None
+        return self.state
+
+    async def _run_one(self, phase):
+        self.current_phase = phase
+        timeout = PHASE_TIMEOUTS.get(phase["type"], DEFAULT_PHASE_TIMEOUT)
+        self.deadline = time.monotonic() + timeout
+        try:
+            await asyncio.wait_for(self.run_phase(phase), timeout)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError as e:
+            # المرحلة خلص وقتها: مو خطأ، ننتقل للي بعدها
+            if self.on_timeout is not None:
+                await self.on_timeout(phase)
+            elif self.on_error is None:
+                raise
+            else:
+                await self.on_error(phase, e)
+        except Exception as e:
+            if self.on_error is None:
+                raise
+            await self.on_error(phase, e)
+
+    def pause(self):
+        self._resume.clear()
+
+    def resume(self):
+        self._resume.set()
+
+    def cancel(self):
+        self.state = CANCELLED
+        self._resume.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
@@ -0,0 +1,167 @@
+import asyncio
+
+from bot.db import DB_PATH, Database
+
+# قناة وهمية للترتيب العام لكل القنوات
+GLOBAL = "*"
+TOP_K = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard (
+    channel TEXT NOT NULL,
+    player TEXT NOT NULL,
+    points INTEGER NOT NULL DEFAULT 0,
+    games INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel, player)
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_rank ON leaderboard (channel, points DESC);
+
+-- عدد اللاعبين عند كل مجموع نقاط لكل قناة، تحدثه الـ triggers تحت. الترتيب يجمع
+-- المجاميع اللي فوق اللاعب، وعددها على قد قيم النقاط المختلفة مو عدد اللاعبين.
+-- (بدون OR IGNORE لأن الـ upsert اللي يشغل الـ trigger يغطي على طريقة التعارض)
+CREATE TABLE IF NOT EXISTS leaderboard_scores (
+    channel TEXT NOT NULL,
+    points INTEGER NOT NULL,
+    players INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (channel, points)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS leaderboard_scores_insert AFTER INSERT ON leaderboard BEGIN
+    INSERT INTO leaderboard_scores (channel, points) SELECT NEW.channel, NEW.points
+    WHERE NOT EXISTS (SELECT 1 FROM leaderboard_scores WHERE channel = NEW.channel AND points = NEW.points);
+    UPDATE leaderboard_scores SET players = players + 1 WHERE channel = NEW.channel AND points = NEW.points;
+END;
+CREATE TRIGGER IF NOT EXISTS leaderboard_scores_update AFTER UPDATE OF points ON leaderboard
+WHEN OLD.points != NEW.points BEGIN
+    UPDATE leaderboard_scores SET players = players - 1 WHERE channel = OLD.channel AND points = OLD.points;
+    DELETE FROM leaderboard_scores WHERE channel = OLD.channel AND points = OLD.points AND players <= 0;
+    INSERT INTO leaderboard_scores (channel, points) SELECT NEW.channel, NEW.points
+    WHERE NOT EXISTS (SELECT 1 FROM leaderboard_scores WHERE channel = NEW.channel AND points = NEW.points);
+    UPDATE leaderboard_scores SET players = players + 1 WHERE channel = NEW.channel AND points = NEW.points;
+END;
+CREATE TRIGGER IF NOT EXISTS leaderboard_scores_delete AFTER DELETE ON leaderboard BEGIN
+    UPDATE leaderboard_scores SET players = players - 1 WHERE channel = OLD.channel AND points = OLD.points;
+    DELETE FROM leaderboard_scores WHERE channel = OLD.channel AND points = OLD.points AND players <= 0;
+END;
+"""
+
+UPSERT = """
+INSERT INTO leaderboard (channel, player, points, games, updated_at)
+VALUES (?, ?, ?, 1, CURRENT_TIMESTAMP)
+ON CONFLICT (channel, player) DO UPDATE SET
+    points = points + excluded.points,
+    games = games + 1,
+    updated_at = CURRENT_TIMESTAMP
+"""
+
+# حد SQLite لعدد المتغيرات في الاستعلام الواحد
+_CHUNK = 500
+
+
+def init_scores(conn):
+    # قاعدة قديمة قبل جدول المجاميع: نبنيه مرة وحدة، وبعدها الـ triggers تكمل
+    if conn.execute("SELECT 1 FROM leaderboard_scores LIMIT 1").fetchone():
+        return
+    with conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO leaderboard_scores (channel, points, players) "
+            "SELECT channel, points, COUNT(*) FROM leaderboard GROUP BY channel, points"
+        )
+
+
+class Leaderboard:
+    """
+    ترتيب اللاعبين الدائم لكل قناة وللكل، محفوظ في widux_panel.db.
+    النقاط تنكتب دفعة وحدة في نهاية كل لعبة، وأعلى K لاعبين لكل قناة محفوظين
+    في الذاكرة ويتحدثون مع كل كتابة، عشان !top ما يقرا من القاعدة. !rank يجمع
+    من جدول leaderboard_scores بدل ما يعد كل اللاعبين اللي فوق.
+    """
+
+    def __init__(self, db_path=DB_PATH, top_k=TOP_K):
+        self.db = Database(db_path, SCHEMA, setup=init_scores)
+        self.top_k = top_k
+        # قناة -> [(اللاعب، النقاط)] مرتبة تنازليًا
+        self._top = {}
+
+    # ---------- قراءة وكتابة مباشرة (تشتغل في thread) ----------
+
+    def fetch_top(self, channel, limit):
+        with self.db.session() as conn:
+            rows = conn.execute(
+                "SELECT player, points FROM leaderboard WHERE channel = ? ORDER BY points DESC LIMIT ?",
+                (channel, limit),
+            ).fetchall()
+        return [(player, points) for player, points in rows]
+
+    def fetch_rank(self, channel, player):
+        with self.db.session() as conn:
+            row = conn.execute(
+                "SELECT points, games FROM leaderboard WHERE channel = ? AND player = ?",
+                (channel, player),
+            ).fetchone()
+            if row is None:
+                return None
+            points, games = row
+            # مجموع اللاعبين عند كل مجموع نقاط أعلى منه
+            above = conn.execute(
+                "SELECT COALESCE(SUM(players), 0) FROM leaderboard_scores WHERE channel = ? AND points > ?",
+                (channel, points),
+            ).fetchone()[0]
+        return {"player": player, "points": points, "games": games, "rank": above + 1}
+
+    def write_game(self, channel, scores):
+        rows = []
+        for player, points in scores.items():
+            rows.append((channel, player, points))
+            rows.append((GLOBAL, player, points))
+        players = list(scores)
+        totals = {channel: {}, GLOBAL: {}}
+        with self.db.session() as conn:
+            with conn:
+                conn.executemany(UPSERT, rows)
+            for key in (channel, GLOBAL):
+                for i in range(0, len(players), _CHUNK):
+                    chunk = players[i:i + _CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    for player, points in conn.execute(
+                        f"SELECT player, points FROM leaderboard WHERE channel = ? AND player IN ({marks})",
+                        (key, *chunk),
+                    ):
+                        totals[key][player] = points
+        return totals
+
+    # ---------- أعلى K في الذاكرة ----------
+
+    def _merge_top(self, channel, totals):
+        top = self._top.get(channel)
+        if top is None:
+            return
+        current = dict(top)
+        for player, points in totals.items():
+            if player in current and points < current[player]:
+                # لاعب من الأوائل نزلت نقاطه، ممكن أحد برا القائمة صار أعلى منه
+                del self._top[channel]
+                return
+            current[player] = points
+        ranked = sorted(current.items(), key=lambda x: x[1], reverse=True)
+        self._top[channel] = ranked[:self.top_k]
+
+    async def record_game(self, channel, scores):
+        if not scores:
+            return
+        channel = channel.lower()
+        totals = await asyncio.to_thread(self.write_game, channel, dict(scores))
+        for key, changed in totals.items():
+            self._merge_top(key, changed)
+
+    async def top(self, channel=GLOBAL, n=None):
+        channel = channel.lower()
+        n = self.top_k if n is None else n
+        if n > self.top_k:
+            return await asyncio.to_thread(self.fetch_top, channel, n)
+        if channel not in self._top:
+            self._top[channel] = await asyncio.to_thread(self.fetch_top, channel, self.top_k)
+        return self._top[channel][:n]
+
+    async def rank(self, channel, player):
+        return await asyncio.to_thread(self.fetch_rank, channel.lower(), player)
@@ -1,61 +1,219 @@
+import asyncio
 import time
 import random
+from collections import OrderedDict, deque
+
+def _insert_by_time(entries, key, value, stamp_of):
+    """
+    يدخل عنصر مسترجع مكانه حسب الوقت، عشان _evict يقدر يوقف عند أول عنصر نشط.
+    المسترجع غالبًا من قبل إعادة التشغيل فأقدم من اللي في الذاكرة، فالبحث من الأول.
+    """
+    stamp = stamp_of(value)
+    older = []
+    for other in entries:
+        if stamp_of(entries[other]) > stamp:
+            break
+        older.append(other)
+    entries[key] = value
+    entries.move_to_end(key, last=False)
+    for other in reversed(older):
+        entries.move_to_end(other, last=False)
+
 
 class MentionGuard:
-    def __init__(self):
-        self.mention_counts = {}
+    """
+    حماية المنشن لكل (قناة، مستخدم): المنشنات تنعد في نافذة متحركة (window ثانية)،
+    فالمنشن القديم يسقط من العد بدل ما يتجمع للأبد. المستخدم اللي ما منشن من مدة
+    أطول من النافذة ينمسح، واللي خلصت مدة التايم أوت حقه ينمسح، فالذاكرة على قد
+    المستخدمين النشطين بس. كل منشن O(1) تقريبًا.
+
+    مع store: التعديلات تنكتب على دفعات كل شوي (flush_loop)، وحالة المستخدم
+    ترجع من القاعدة أول ما يمنشن بعد إعادة التشغيل (restore).
+    """
+
+    def __init__(self, store=None):
+        # المفتاح -> deque بأوقات المنشنات داخل النافذة، الأقدم نشاطًا أول
+        self.mention_counts = OrderedDict()
         self.timeout_given = {}
         self.special_responses = {}
         self.general_roasts = []
-        self.no_timeout_users = {}
+        # المفتاح -> وقت آخر تايم أوت، بترتيب الوقت
+        self.no_timeout_users = OrderedDict()
 
         self.mention_limit = 3
         self.warning_threshold = 2
         self.timeout_duration = 5
         self.cooldown_period = 86400
+        self.window = 600
         self.warning_message = "انتبه، باقي لك شوي وتبلع تايم"
         self.timeout_message = "لقم تايم أوت بسيط، مزحة من البوت"
 
-    def set_config(self, limit, duration, cooldown, warning_thresh, warn_msg, timeout_msg):
-        self.mention_limit = limit
-        self.timeout_duration = duration
-        self.cooldown_period = cooldown
-        self.warning_threshold = warning_thresh
-        self.warning_message = warn_msg
-        self.timeout_message = timeout_msg
+        # أطول نافذة ومدة تايم أوت انستخدمت (الإعدادات تختلف بين القنوات)
+        self._max_window = self.window
+        self._max_cooldown = self.cooldown_period
+        self.evicted = 0
+
+        self.store = store
+        # المفاتيح اللي تغيرت ولسا ما انكتبت في القاعدة
+        self._dirty = set()
+        self.flushed = 0
+
+    def set_config(self, limit, duration, cooldown, warning_thresh, warn_msg, timeout_msg, window=None):
+        # الإعداد الفاضي يخلي القيمة الافتراضية
+        for name, value in (
+            ("mention_limit", limit),
+            ("timeout_duration", duration),
+            ("cooldown_period", cooldown),
+            ("warning_threshold", warning_thresh),
+            ("warning_message", warn_msg),
+            ("timeout_message", timeout_msg),
+            ("window", window),
+        ):
+            if value is not None:
+                setattr(self, name, value)
+        # إعدادات القنوات ترفعها مرة ثانية أول ما ينعالج منشن فيها
+        self._max_window = self.window
+        self._max_cooldown = self.cooldown_period
 
     def add_special_responses(self, username, responses):
         self.special_responses[username] = responses
 
-    def handle_mention(self, user):
+    def _limits(self, config):
+        # إعدادات القناة إذا موجودة، وإلا الإعدادات العامة
+        if not config:
+            return (self.mention_limit, self.warning_threshold, self.timeout_duration,
+                    self.cooldown_period, self.window, self.warning_message, self.timeout_message)
+        return (
+            config.get("mention_limit") or self.mention_limit,
+            config.get("mention_guard_warning_thresh") or self.warning_threshold,
+            config.get("mention_guard_duration") or self.timeout_duration,
+            config.get("mention_guard_cooldown") or self.cooldown_period,
+            config.get("mention_guard_window") or self.window,
+            config.get("mention_guard_warn_msg") or self.warning_message,
+            config.get("mention_guard_timeout_msg") or self.timeout_message,
+        )
+
+    def _evict(self, now):
+        # الأقدم أول في الترتيب، فنوقف عند أول واحد لسا نشط
+        while self.mention_counts:
+            key, stamps = next(iter(self.mention_counts.items()))
+            if stamps and now - stamps[-1] < self._max_window:
+                break
+            self.mention_counts.popitem(last=False)
+            self.evicted += 1
+        while self.no_timeout_users:
+            key, given = next(iter(self.no_timeout_users.items()))
+            if now - given < self._max_cooldown:
+                break
+            self.no_timeout_users.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self):
+        return {
+            "tracked_users": len(self.mention_counts),
+            "cooldown_users": len(self.no_timeout_users),
+            "evicted": self.evicted,
+            "pending_writes": len(self._dirty),
+            "flushed": self.flushed,
+        }
+
+    @staticmethod
+    def _key(user, channel):
+        return user if channel is None else (channel.lower(), user)
+
+    async def restore(self, user, channel=None):
+        """
+        يرجع حالة المستخدم من القاعدة إذا مو موجودة في الذاكرة، قبل handle_mention.
+        """
+        key = self._key(user, channel)
+        if self.store is None or user in self.special_responses:
+            return
+        if key in self.mention_counts or key in self.no_timeout_users or key in self._dirty:
+            return
+        row = await asyncio.to_thread(self.store.load, (channel or "").lower(), user)
+        # ممكن وصل منشن ثاني لنفس المستخدم وقت القراءة، والذاكرة أحدث
+        if row is None or key in self.mention_counts or key in self.no_timeout_users:
+            return
+        stamps, timeout_at = row
+        if stamps:
+            _insert_by_time(self.mention_counts, key, deque(stamps), lambda s: s[-1])
+        if timeout_at:
+            _insert_by_time(self.no_timeout_users, key, timeout_at, lambda given: given)
+
+    async def flush(self):
+        # يكتب كل المفاتيح اللي تغيرت من آخر دفعة بطلب واحد
+        if self.store is None or not self._dirty:
+            return 0
         now = time.time()
+        keys, self._dirty = self._dirty, set()
+        rows = []
+        for key in keys:
+            channel, user = ("", key) if isinstance(key, str) else key
+            rows.append((channel, user, list(self.mention_counts.get(key, ())),
+                         self.no_timeout_users.get(key), now))
+        try:
+            await asyncio.to_thread(
+                self.store.save_many, rows, now - self._max_window, now - self._max_cooldown
+            )
+        except Exception as e:
+            # تنكتب مع الدفعة الجاية
+            self._dirty |= keys
+            print(f"[خطأ حفظ حماية المنشن] {e}")
+            return 0
+        self.flushed += len(rows)
+        return len(rows)
+
+    async def flush_loop(self, interval=5):
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
+    def handle_mention(self, user, config=None, channel=None):
+        now = time.time()
+        limit, warning_threshold, timeout_duration, cooldown_period, window, warning_message, timeout_message = \
+            self._limits(config)
+        self._max_window = max(self._max_window, window)
+        self._max_cooldown = max(self._max_cooldown, cooldown_period)
+        self._evict(now)
+        key = self._key(user, channel)
 
         # 1. إذا عنده ردود خاصة → دايمًا ياخذ طقطقة خاصة
         if user in self.special_responses:
             return {"action": "roast", "message": random.choice(self.special_responses[user])}
 
-        # 2. إذا أخذ تايم أوت سابقًا → تحقق إذا مر يوم كامل
-        if user in self.no_timeout_users:
-            if now - self.no_timeout_users[user] < self.cooldown_period:
+        if self.store is not None:
+            self._dirty.add(key)
+
+        # 2. إذا أخذ تايم أوت سابقًا → تحقق إذا خلصت مدة السماح
+        if key in self.no_timeout_users:
+            if now - self.no_timeout_users[key] < cooldown_period:
                 return {"action": "roast", "message": random.choice(self.general_roasts)}
             else:
-                del self.no_timeout_users[user]  # يمسح القديم ويرجع يعد من جديد
+                del self.no_timeout_users[key]  # يمسح القديم ويرجع يعد من جديد
 
-        # 3. زيد عدد المنشنات
-        self.mention_counts[user] = self.mention_counts.get(user, 0) + 1
-        count = self.mention_counts[user]
+        # 3. زيد عدد المنشنات داخل النافذة بس
+        stamps = self.mention_counts.pop(key, None)
+        if stamps is None:
+            stamps = deque()
+        while stamps and now - stamps[0] >= window:
+            stamps.popleft()
+        stamps.append(now)
+        self.mention_counts[key] = stamps
+        count = len(stamps)
 
         # 4. إذا وصل للتحذير
-        if count == self.warning_threshold:
-            return {"action": "warn", "message": self.warning_message}
+        if count == warning_threshold:
+            return {"action": "warn", "message": warning_message}
 
         # 5. إذا تجاوز الحد المسموح به للمنشن
-        if count >= self.mention_limit:
-            self.no_timeout_users[user] = now
+        if count >= limit:
+            del self.mention_counts[key]
+            self.no_timeout_users.pop(key, None)
+            self.no_timeout_users[key] = now
             return {
                 "action": "timeout",
-                "message": self.timeout_message,
-                "duration": self.timeout_duration
+                "message": timeout_message,
+                "duration": timeout_duration
             }
 
         # 6. رد عادي قبل لا يوصل حد التايم أوت
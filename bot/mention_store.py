@@ -0,0 +1,71 @@
+from bot.db import DB_PATH, Database
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mention_guard (
+    channel TEXT NOT NULL,
+    user TEXT NOT NULL,
+    stamps TEXT NOT NULL DEFAULT '',
+    timeout_at REAL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (channel, user)
+);
+CREATE INDEX IF NOT EXISTS idx_mention_guard_updated ON mention_guard (updated_at);
+"""
+
+# أكثر من عملية ممكن تكتب نفس المستخدم: آخر كتابة تغلب في أوقات المنشن،
+# والتايم أوت الأحدث يبقى دايمًا عشان ما يضيع تايم أوت أعطته عملية ثانية
+UPSERT = """
+INSERT INTO mention_guard (channel, user, stamps, timeout_at, updated_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (channel, user) DO UPDATE SET
+    stamps = CASE WHEN excluded.updated_at >= updated_at THEN excluded.stamps ELSE stamps END,
+    timeout_at = MAX(COALESCE(timeout_at, 0), COALESCE(excluded.timeout_at, 0)),
+    updated_at = MAX(updated_at, excluded.updated_at)
+"""
+
+PRUNE = "DELETE FROM mention_guard WHERE updated_at < ? AND COALESCE(timeout_at, 0) < ?"
+
+
+def _encode(stamps):
+    return ",".join(f"{stamp:.3f}" for stamp in stamps)
+
+
+def _decode(text):
+    return [float(stamp) for stamp in text.split(",")] if text else []
+
+
+class MentionStore:
+    """
+    حالة حماية المنشن محفوظة في widux_panel.db عشان التايم أوت ما ينمسح مع إعادة
+    التشغيل. الملف مشترك (WAL)، فكل عمليات البوت تقرا وتكتب نفس الحالة.
+    """
+
+    def __init__(self, db_path=DB_PATH):
+        self.db = Database(db_path, SCHEMA)
+
+    def load(self, channel, user):
+        """يرجع (أوقات المنشن، وقت آخر تايم أوت أو None)، أو None إذا المستخدم مو محفوظ."""
+        with self.db.session() as conn:
+            row = conn.execute(
+                "SELECT stamps, timeout_at FROM mention_guard WHERE channel = ? AND user = ?",
+                (channel, user),
+            ).fetchone()
+        if row is None:
+            return None
+        stamps, timeout_at = row
+        return _decode(stamps), timeout_at or None
+
+    def save_many(self, rows, idle_before=None, expired_before=None):
+        """
+        يكتب دفعة (channel, user, stamps, timeout_at, updated_at) في transaction وحدة،
+        ويمسح بنفس الدفعة اللي ما منشن من قبل idle_before وخلص التايم أوت حقه.
+        """
+        params = [
+            (channel, user, _encode(stamps), timeout_at, updated_at)
+            for channel, user, stamps, timeout_at, updated_at in rows
+        ]
+        with self.db.session() as conn:
+            with conn:
+                conn.executemany(UPSERT, params)
+                if idle_before is not None:
+                    conn.execute(PRUNE, (idle_before, expired_before or idle_before))
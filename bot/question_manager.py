@@ -1,45 +1,79 @@
-import requests
-import random
+import asyncio
+import time
+from types import MappingProxyType
+
+from bot.question_sampler import QuestionSampler
+from bot.question_store import QuestionStore, QUESTION_TYPES, canonical_type
+
 
 class QuestionManager:
-    def __init__(self):
-        self.api_url = "http://localhost:9001/api/questions"
-        self.questions_by_type = {
-            "Normal": [],
-            "Golden": [],
-            "Steal": [],
-            "Sabotage": [],
-            "Doom": [],
-            "Fate": []
+    """
+    واجهة البوت لبنك الأسئلة. القراءة كلها من QuestionStore مباشرة في thread منفصل،
+    فلا تحميل للبنك كامل في الذاكرة ولا انتظار على HTTP داخل الـ event loop.
+    """
+
+    def __init__(self, store=None, sampler=None):
+        self.store = store or QuestionStore()
+        self.sampler = sampler or QuestionSampler(self.store, self.store.db_path)
+        self.counts = MappingProxyType({qtype: 0 for qtype in QUESTION_TYPES})
+        self.stats = {
+            "loads": 0,
+            "load_seconds": None,
+            "bank_size": 0,
+            "last_error": None,
         }
+        self._loading = None
 
-    def load_questions(self):
+    async def _load(self):
+        started = time.perf_counter()
         try:
-            response = requests.get(self.api_url)
-            if response.status_code == 200:
-                questions = response.json()
-                for q in questions:
-                    qtype = q["type"]
-                    if qtype in self.questions_by_type:
-                        self.questions_by_type[qtype].append(q)
-            else:
-                print("فشل في جلب الأسئلة من API")
+            _, counts = await asyncio.to_thread(self.store.state)
         except Exception as e:
-            print(f"خطأ في الاتصال بـ API: {e}")
+            self.stats["last_error"] = str(e)
+            print(f"خطأ في تحميل الأسئلة: {e}")
+            return False
 
-    def get_questions_by_type(self, qtype, count=None):
-        if not self.questions_by_type[qtype]:
-            self.load_questions()
+        self.counts = MappingProxyType(counts)
+        self.stats.update(
+            loads=self.stats["loads"] + 1,
+            load_seconds=round(time.perf_counter() - started, 4),
+            bank_size=sum(counts.values()),
+            last_error=None,
+        )
+        print(
+            f"[بنك الأسئلة] {self.stats['bank_size']} سؤال {dict(counts)} "
+            f"في {self.stats['load_seconds']}ث"
+        )
+        return True
+
+    async def load_questions(self):
+        # إذا فيه تحميل شغال، ننتظره بدل ما نطلب مرة ثانية
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load())
+        try:
+            return await asyncio.shield(self._loading)
+        finally:
+            if self._loading is not None and self._loading.done():
+                self._loading = None
 
-        questions = self.questions_by_type[qtype]
+    async def type_counts(self):
+        # أعداد الأنواع من question_counts (قراءة وحدة مهما كبر البنك)
+        counts = await asyncio.to_thread(self.store.counts)
+        self.counts = MappingProxyType(counts)
+        return self.counts
 
-        if count:
-            return random.sample(questions, min(count, len(questions)))
-        return questions
+    async def get_questions_by_type(self, qtype, count=None, channel=None):
+        # مع قناة: السحب من كيس القناة عشان ما يتكرر سؤال لين يخلص البنك
+        qtype = canonical_type(qtype)
+        if count is None:
+            return await asyncio.to_thread(self.store.all, qtype)
+        if channel:
+            return await asyncio.to_thread(self.sampler.draw, channel, qtype, count)
+        return await asyncio.to_thread(self.store.sample, qtype, count)
 
-    def get_random_question(self, qtype):
-        if not self.questions_by_type[qtype]:
-            self.load_questions()
+    async def draw_many(self, channel, needs):
+        return await asyncio.to_thread(self.sampler.draw_many, channel, needs)
 
-        questions = self.questions_by_type[qtype]
-        return random.choice(questions) if questions else None
+    async def get_random_question(self, qtype, channel=None):
+        questions = await self.get_questions_by_type(qtype, 1, channel)
+        return questions[0] if questions else None
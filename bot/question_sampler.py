@@ -0,0 +1,189 @@
+import random
+from array import array
+
+from bot.db import DB_PATH, Database
+from bot.question_store import canonical_type
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS question_bags (
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    ids BLOB NOT NULL,
+    cursor INTEGER NOT NULL DEFAULT 0,
+    -- نسخة البنك (question_changes) اللي الكيس محدث عليها
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (channel, type)
+);
+"""
+
+# كل id في الترتيب المحفوظ 4 بايت (array من نوع I)
+ITEM_SIZE = array("I").itemsize
+# عدد التعديلات اللي تنقرا من السجل في كل مرة وقت تحديث كيس
+CATCH_UP_PAGE = 1000
+
+
+def shuffled_ids(ids):
+    bag = array("I", ids)
+    random.shuffle(bag)
+    return bag
+
+
+def add_version_column(conn):
+    # أكياس قديمة قبل عمود النسخة: تاخذ كل السجل مرة وحدة أول سحب
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(question_bags)")}
+    if "version" not in columns:
+        with conn:
+            conn.execute("ALTER TABLE question_bags ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+
+def merge_changes(changes):
+    # سجل التعديلات بالترتيب -> (الجديد بترتيبه، المحذوف)
+    added = {}
+    gone = set()
+    for _, qid, _, op in changes:
+        if op == "add":
+            added[qid] = None
+            gone.discard(qid)
+        elif op == "delete":
+            if qid in added:
+                del added[qid]
+            else:
+                gone.add(qid)
+    return list(added), gone
+
+
+class QuestionSampler:
+    """
+    سحب أسئلة بدون تكرار لكل قناة ولكل نوع (shuffle bag). كل كيس هو ترتيب عشوائي
+    لأسئلة النوع محفوظ كـ BLOB في question_bags مع مؤشر، فالقناة تخلص البنك كامل
+    قبل ما يرجع أي سؤال حتى لو البوت انعاد تشغيله. السحب يقرا من الـ BLOB الجزء
+    المطلوب بس، فما فيه ترتيب محمل في الذاكرة لأي قناة.
+
+    تعديلات البنك توصل للكيس وقت السحب منه بس: كل كيس يعرف نسخة البنك اللي هو
+    عليها، فإذا تأخر ياخذ تعديلات نوعه من بعدها ويدخلها في الجزء اللي ما انسحب.
+    الأكياس اللي ما أحد يسحب منها ما تنقرا ولا تنكتب.
+    """
+
+    def __init__(self, store, db_path=DB_PATH):
+        self.store = store
+        self.db = Database(db_path, SCHEMA, setup=add_version_column)
+
+    def _take(self, conn, channel, qtype, n):
+        row = conn.execute(
+            "SELECT substr(ids, cursor * ? + 1, ?), cursor FROM question_bags WHERE channel = ? AND type = ?",
+            (ITEM_SIZE, n * ITEM_SIZE, channel, qtype),
+        ).fetchone()
+        if row is None:
+            return [], 0
+        picked = array("I")
+        picked.frombytes(bytes(row[0] or b""))
+        return picked.tolist(), row[1] + len(picked)
+
+    def _reshuffle(self, conn, channel, qtype):
+        # النسخة قبل الأسئلة: أي تعديل بينهم ينطبق مرة ثانية بدون ضرر
+        version = self.store.version()
+        bag = shuffled_ids(self.store.ids(qtype))
+        conn.execute(
+            "INSERT OR REPLACE INTO question_bags (channel, type, ids, cursor, version) VALUES (?, ?, ?, 0, ?)",
+            (channel, qtype, bag.tobytes(), version),
+        )
+        return len(bag)
+
+    def _catch_up(self, conn, channel, qtype, latest):
+        """
+        يطبق على كيس واحد تعديلات نوعه من بعد نسخته: الجديد يدخل بمكان عشوائي في
+        الجزء اللي ما انسحب والمحذوف يطلع منه، بدون إعادة خلط، والكيس ينكتب بس إذا تغير.
+        """
+        row = conn.execute(
+            "SELECT version FROM question_bags WHERE channel = ? AND type = ?", (channel, qtype)
+        ).fetchone()
+        if row is None:
+            return
+        version = current = row[0]
+        if latest <= version:
+            return
+        changes = []
+        while True:
+            page = self.store.changes_since(current, CATCH_UP_PAGE, qtype)
+            changes += page
+            if len(page) < CATCH_UP_PAGE:
+                break
+            current = page[-1][0]
+        added, gone = merge_changes(changes)
+        if not added and not gone:
+            conn.execute(
+                "UPDATE question_bags SET version = ? WHERE channel = ? AND type = ?", (latest, channel, qtype)
+            )
+            return
+        blob, cursor = conn.execute(
+            "SELECT ids, cursor FROM question_bags WHERE channel = ? AND type = ?", (channel, qtype)
+        ).fetchone()
+        ids = array("I")
+        ids.frombytes(blob)
+        present = set(ids)
+        bag = ids[:cursor]
+        rest = array("I", (qid for qid in ids[cursor:] if qid not in gone))
+        for qid in added:
+            if qid in present:
+                continue
+            # مكان عشوائي في الباقي، وترتيب الباقي يبقى مثل ما هو
+            rest.insert(random.randint(0, len(rest)), qid)
+        bag.extend(rest)
+        conn.execute(
+            "UPDATE question_bags SET ids = ?, version = ? WHERE channel = ? AND type = ?",
+            (bag.tobytes(), latest, channel, qtype),
+        )
+
+    def draw_ids(self, channel, qtype, n, exclude=()):
+        qtype = canonical_type(qtype)
+        if qtype is None or n <= 0:
+            return []
+        channel = channel.lower()
+        # النسخة قبل الـ transaction وقبل التعديلات، عشان أي تعديل يوصل بينهم ما يفوت الكيس
+        latest = self.store.version()
+        with self.db.session() as conn:
+            with conn:
+                self._catch_up(conn, channel, qtype, latest)
+                picked, cursor = self._take(conn, channel, qtype, n)
+                if len(picked) < n:
+                    # الكيس خلص: نخلط من جديد ونكمل بدون ما نعيد اللي انسحب الحين
+                    size = self._reshuffle(conn, channel, qtype)
+                    taken = set(picked).union(exclude)
+                    more, cursor = self._take(conn, channel, qtype, min(size, n - len(picked) + len(taken)))
+                    for i, qid in enumerate(more):
+                        if len(picked) >= n:
+                            cursor -= len(more) - i
+                            break
+                        if qid not in taken:
+                            picked.append(qid)
+                conn.execute(
+                    "UPDATE question_bags SET cursor = ? WHERE channel = ? AND type = ?",
+                    (cursor, channel, qtype),
+                )
+        return picked
+
+    def draw_many(self, channel, needs):
+        """
+        يسحب لكل نوع في needs ({النوع: العدد}) من كيس القناة، ويجيب كل الأسئلة
+        باستعلام واحد. يرجع {النوع: [الأسئلة]}.
+        """
+        drawn = {qtype: self.draw_ids(channel, qtype, n) for qtype, n in needs.items()}
+        found = {q["id"]: q for q in self.store.fetch_many([qid for ids in drawn.values() for qid in ids])}
+        resolved = {}
+        for qtype, ids in drawn.items():
+            questions = [found[qid] for qid in ids if qid in found]
+            if len(questions) < needs[qtype]:
+                # فيه أسئلة انحذفت بعد الخلط، نكمل بسحب ثاني لهذا النوع بس
+                questions += self.draw(channel, qtype, needs[qtype] - len(questions), exclude=ids)
+            resolved[qtype] = questions
+        return resolved
+
+    def draw(self, channel, qtype, n, exclude=()):
+        # الأسئلة المحذوفة من البنك بعد الخلط تنتخطى، ونسحب بدالها
+        questions = []
+        for _ in range(3):
+            skip = set(exclude).union(q["id"] for q in questions)
+            questions += self.store.fetch_many(self.draw_ids(channel, qtype, n - len(questions), skip))
+            if len(questions) >= n:
+                break
+        return questions
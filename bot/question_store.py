@@ -0,0 +1,380 @@
+import json
+import os
+import random
+
+from bot.db import DB_PATH, Database
+
+QUESTION_TYPES = ("Normal", "Golden", "Steal", "Sabotage", "Doom", "Fate")
+LEGACY_BANK = "data/questions_bank.json"
+
+# نفس جدول widux_panel.db، عشان القواعد الجديدة تطلع بنفس الشكل
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    alt_answers TEXT,
+    category TEXT,
+    type TEXT CHECK(type IN ('Normal', 'Golden', 'Steal', 'Sabotage', 'Doom', 'Fate')),
+    -- الأخطاء الإملائية المسموحة لهذا السؤال، وإذا فاضي الافتراضي لنوعه
+    max_typos INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_questions_type ON questions (type);
+CREATE INDEX IF NOT EXISTS idx_questions_category ON questions (category);
+
+-- عدد الأسئلة لكل نوع، تحدثه الـ triggers تحت عشان تشغيل البوت ما يعد البنك كامل
+CREATE TABLE IF NOT EXISTS question_counts (
+    type TEXT PRIMARY KEY,
+    count INTEGER NOT NULL DEFAULT 0
+);
+
+-- كل تعديل على الأسئلة (من البوت أو اللوحة أو أي سكربت) ينسجل هنا برقم نسخة يزيد دايمًا
+CREATE TABLE IF NOT EXISTS question_changes (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER NOT NULL,
+    type TEXT,
+    op TEXT NOT NULL CHECK(op IN ('add', 'update', 'delete'))
+);
+CREATE TRIGGER IF NOT EXISTS questions_changes_insert AFTER INSERT ON questions BEGIN
+    INSERT INTO question_changes (question_id, type, op) VALUES (NEW.id, NEW.type, 'add');
+    INSERT OR IGNORE INTO question_counts (type, count) VALUES (NEW.type, 0);
+    UPDATE question_counts SET count = count + 1 WHERE type IS NEW.type;
+END;
+CREATE TRIGGER IF NOT EXISTS questions_changes_delete AFTER DELETE ON questions BEGIN
+    INSERT INTO question_changes (question_id, type, op) VALUES (OLD.id, OLD.type, 'delete');
+    UPDATE question_counts SET count = count - 1 WHERE type IS OLD.type;
+END;
+CREATE TRIGGER IF NOT EXISTS questions_changes_update AFTER UPDATE ON questions
+WHEN OLD.type IS NEW.type BEGIN
+    INSERT INTO question_changes (question_id, type, op) VALUES (NEW.id, NEW.type, 'update');
+END;
+CREATE TRIGGER IF NOT EXISTS questions_changes_retype AFTER UPDATE ON questions
+WHEN OLD.type IS NOT NEW.type BEGIN
+    INSERT INTO question_changes (question_id, type, op) VALUES (OLD.id, OLD.type, 'delete');
+    INSERT INTO question_changes (question_id, type, op) VALUES (NEW.id, NEW.type, 'add');
+    UPDATE question_counts SET count = count - 1 WHERE type IS OLD.type;
+    INSERT OR IGNORE INTO question_counts (type, count) VALUES (NEW.type, 0);
+    UPDATE question_counts SET count = count + 1 WHERE type IS NEW.type;
+END;
+"""
+
+# أسماء الأنواع اللي ممكن تجي من اللوحة أو من مراحل اللعبة
+TYPE_ALIASES = {
+    "normal": "Normal",
+    "عادي": "Normal",
+    "golden": "Golden",
+    "ذهبي": "Golden",
+    "steal": "Steal",
+    "steal_or_boost": "Steal",
+    "سرقة": "Steal",
+    "زرف": "Steal",
+    "sabotage": "Sabotage",
+    "تخريب": "Sabotage",
+    "doom": "Doom",
+    "دوم": "Doom",
+    "fate": "Fate",
+    "مصير": "Fate",
+}
+
+COLUMNS = "id, question, correct_answer, alt_answers, category, type, max_typos"
+INSERT_QUESTION = (
+    "INSERT INTO questions (question, correct_answer, alt_answers, category, type, max_typos) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+# أكبر عدد أخطاء ينقبل من البنك، أكثر من كذا الإجابات الغلط تصير صح
+MAX_TYPOS_LIMIT = 3
+
+
+def canonical_type(value):
+    if value in QUESTION_TYPES:
+        return value
+    return TYPE_ALIASES.get((value or "").strip().lower())
+
+
+def row_to_question(row):
+    qid, question, answer, alt_answers, category, qtype, max_typos = row
+    return {
+        "id": qid,
+        "question": question,
+        "answer": answer,
+        "alternatives": json.loads(alt_answers) if alt_answers else [],
+        "category": category,
+        "type": qtype,
+        "max_typos": max_typos,
+    }
+
+
+def validate_question(data):
+    """
+    يرجع (الصف الجاهز للإدخال، None) أو (None، رسالة الخطأ).
+    """
+    question = (data.get("question") or "").strip()
+    answer = (data.get("answer") or data.get("correct_answer") or "").strip()
+    qtype = canonical_type(data.get("type"))
+    alternatives = data.get("alternatives", data.get("alt_answers")) or []
+    if isinstance(alternatives, str):
+        alternatives = [a.strip() for a in alternatives.split(",")]
+    alternatives = [a.strip() for a in alternatives if isinstance(a, str) and a.strip()]
+
+    if not question or not answer:
+        return None, "بيانات السؤال ناقصة"
+    if qtype is None:
+        return None, "نوع السؤال غير صالح"
+    category = (data.get("category") or "").strip() or None
+    max_typos = data.get("max_typos")
+    if max_typos == "":
+        max_typos = None
+    if max_typos is not None:
+        try:
+            max_typos = int(max_typos)
+        except (TypeError, ValueError):
+            max_typos = -1
+        if isinstance(data.get("max_typos"), bool) or not 0 <= max_typos <= MAX_TYPOS_LIMIT:
+            return None, f"عدد الأخطاء المسموحة لازم يكون من 0 إلى {MAX_TYPOS_LIMIT}"
+    return (question, answer, json.dumps(alternatives, ensure_ascii=False), category, qtype, max_typos), None
+
+
+class QuestionStore:
+    """
+    بنك الأسئلة في جدول questions داخل widux_panel.db، مع فهارس على النوع والتصنيف.
+    كل سؤال له id ثابت، والسحب العشوائي يصير على الفهرس بدون تحميل البنك كامل.
+    """
+
+    def __init__(self, db_path=DB_PATH, legacy_path=LEGACY_BANK):
+        self.db_path = db_path
+        self.legacy_path = legacy_path
+        self.db = Database(db_path, SCHEMA, setup=self._setup)
+
+    def _setup(self, conn):
+        self._add_missing_columns(conn)
+        self._init_counts(conn)
+        self._import_legacy(conn)
+
+    def _add_missing_columns(self, conn):
+        # قاعدة قديمة قبل عمود max_typos
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(questions)")}
+        if "max_typos" not in columns:
+            with conn:
+                conn.execute("ALTER TABLE questions ADD COLUMN max_typos INTEGER")
+
+    def _init_counts(self, conn):
+        # قاعدة قديمة قبل جدول الأعداد: نعدها مرة وحدة، وبعدها الـ triggers تكمل
+        if conn.execute("SELECT 1 FROM question_counts LIMIT 1").fetchone():
+            return
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO question_counts (type, count) SELECT type, COUNT(*) FROM questions GROUP BY type"
+            )
+
+    def _import_legacy(self, conn):
+        # أول تشغيل: ننقل الأسئلة من ملف JSON القديم إذا الجدول فاضي
+        if conn.execute("SELECT 1 FROM questions LIMIT 1").fetchone():
+            return
+        if not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (ValueError, OSError):
+            return
+        rows = [row for row, error in map(validate_question, legacy or []) if row]
+        if rows:
+            with conn:
+                conn.executemany(INSERT_QUESTION, rows)
+
+    # ---------- كتابة ----------
+
+    def add(self, data):
+        row, error = validate_question(data)
+        if error:
+            raise ValueError(error)
+        with self.db.session() as conn:
+            with conn:
+                cursor = conn.execute(INSERT_QUESTION, row)
+            return cursor.lastrowid
+
+    def add_many(self, rows):
+        # صفوف جاهزة من validate_question، كلها في transaction وحدة
+        with self.db.session() as conn:
+            with conn:
+                conn.executemany(INSERT_QUESTION, rows)
+        return len(rows)
+
+    def update(self, qid, data):
+        # الـ id يبقى نفسه، فأكياس القنوات وسجل النقاط ما يتأثرون بالتعديل
+        row, error = validate_question(data)
+        if error:
+            raise ValueError(error)
+        with self.db.session() as conn:
+            with conn:
+                cursor = conn.execute(
+                    "UPDATE questions SET question = ?, correct_answer = ?, alt_answers = ?, category = ?, type = ?, "
+                    "max_typos = ? WHERE id = ?",
+                    (*row, qid),
+                )
+            return cursor.rowcount > 0
+
+    def delete(self, qid):
+        with self.db.session() as conn:
+            with conn:
+                cursor = conn.execute("DELETE FROM questions WHERE id = ?", (qid,))
+            return cursor.rowcount > 0
+
+    # ---------- قراءة ----------
+
+    def all(self, qtype=None):
+        with self.db.session() as conn:
+            if qtype is None:
+                rows = conn.execute(f"SELECT {COLUMNS} FROM questions ORDER BY id").fetchall()
+            else:
+                rows = conn.execute(
+                    f"SELECT {COLUMNS} FROM questions WHERE type = ? ORDER BY id", (canonical_type(qtype),)
+                ).fetchall()
+        return [row_to_question(row) for row in rows]
+
+    def iter_all(self, qtype=None, batch=500):
+        # صفحات بالـ id بدل OFFSET، فالتصدير ما يحمل البنك كامل ولا يمسك القفل طول الوقت
+        qtype = canonical_type(qtype) if qtype else None
+        last = 0
+        while True:
+            with self.db.session() as conn:
+                if qtype is None:
+                    rows = conn.execute(
+                        f"SELECT {COLUMNS} FROM questions WHERE id > ? ORDER BY id LIMIT ?", (last, batch)
+                    ).fetchall()
+                else:
+                    rows = conn.execute(
+                        f"SELECT {COLUMNS} FROM questions WHERE type = ? AND id > ? ORDER BY id LIMIT ?",
+                        (qtype, last, batch),
+                    ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row_to_question(row)
+            last = rows[-1][0]
+
+    def page(self, limit, cursor=None, qtype=None, category=None):
+        """
+        صفحة من الأسئلة بعد id معين (cursor)، مع فلترة اختيارية بالنوع والتصنيف.
+        يرجع (الأسئلة، cursor الصفحة اللي بعدها أو None).
+        """
+        where = ["id > ?"]
+        params = [cursor or 0]
+        if qtype:
+            where.append("type = ?")
+            params.append(canonical_type(qtype))
+        if category:
+            where.append("category = ?")
+            params.append(category)
+        with self.db.session() as conn:
+            rows = conn.execute(
+                f"SELECT {COLUMNS} FROM questions WHERE {' AND '.join(where)} ORDER BY id LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+        questions = [row_to_question(row) for row in rows[:limit]]
+        next_cursor = questions[-1]["id"] if len(rows) > limit else None
+        return questions, next_cursor
+
+    def get(self, qid):
+        found = self.fetch_many([qid])
+        return found[0] if found else None
+
+    def fetch_many(self, ids):
+        ids = list(ids)
+        if not ids:
+            return []
+        found = {}
+        with self.db.session() as conn:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for row in conn.execute(f"SELECT {COLUMNS} FROM questions WHERE id IN ({marks})", chunk):
+                    found[row[0]] = row_to_question(row)
+        # نفس ترتيب الـ ids المطلوبة
+        return [found[qid] for qid in ids if qid in found]
+
+    def ids(self, qtype):
+        # أرقام أسئلة النوع من الفهرس بس، بدون قراءة نص الأسئلة
+        with self.db.session() as conn:
+            rows = conn.execute(
+                "SELECT id FROM questions WHERE type = ? ORDER BY id", (canonical_type(qtype),)
+            ).fetchall()
+        return [qid for (qid,) in rows]
+
+    def counts(self):
+        return self.state()[1]
+
+    def state(self):
+        # النسخة والأعداد من نفس القراءة، عشان التغييرات بعدها تنطبق كفروقات بدون فجوة
+        with self.db.session() as conn:
+            conn.execute("BEGIN")
+            try:
+                version = conn.execute("SELECT COALESCE(MAX(version), 0) FROM question_changes").fetchone()[0]
+                rows = conn.execute("SELECT type, count FROM question_counts").fetchall()
+            finally:
+                conn.execute("COMMIT")
+        counts = {qtype: 0 for qtype in QUESTION_TYPES}
+        counts.update({qtype: count for qtype, count in rows if qtype in counts})
+        return version, counts
+
+    # ---------- النسخ ----------
+
+    def version(self):
+        with self.db.session() as conn:
+            row = conn.execute("SELECT COALESCE(MAX(version), 0) FROM question_changes").fetchone()
+        return row[0]
+
+    def changes_since(self, version, limit=1000, qtype=None):
+        with self.db.session() as conn:
+            if qtype is None:
+                return conn.execute(
+                    "SELECT version, question_id, type, op FROM question_changes WHERE version > ? ORDER BY version LIMIT ?",
+                    (version, limit),
+                ).fetchall()
+            return conn.execute(
+                "SELECT version, question_id, type, op FROM question_changes "
+                "WHERE version > ? AND type = ? ORDER BY version LIMIT ?",
+                (version, qtype, limit),
+            ).fetchall()
+
+    def sample_ids(self, qtype, n, exclude=()):
+        """
+        يختار n أسئلة عشوائية من نوع معين: نختار id عشوائي بين أصغر وأكبر id للنوع
+        وناخذ أول سؤال بعده على فهرس (type, id)، بدل ORDER BY RANDOM() على كل الجدول.
+        """
+        qtype = canonical_type(qtype)
+        if qtype is None or n <= 0:
+            return []
+        exclude = set(exclude)
+        with self.db.session() as conn:
+            low, high = conn.execute("SELECT MIN(id), MAX(id) FROM questions WHERE type = ?", (qtype,)).fetchone()
+            if low is None:
+                return []
+            picked = []
+            seen = set(exclude)
+            for _ in range(n * 4 + 8):
+                if len(picked) >= n:
+                    break
+                pivot = random.randint(low, high)
+                row = conn.execute(
+                    "SELECT id FROM questions WHERE type = ? AND id >= ? ORDER BY id LIMIT 1", (qtype, pivot)
+                ).fetchone()
+                if row and row[0] not in seen:
+                    seen.add(row[0])
+                    picked.append(row[0])
+            if len(picked) < n:
+                # النوع صغير أو مليان فراغات: نكمل من أسئلة النوع نفسه بس
+                rows = conn.execute(
+                    "SELECT id FROM questions WHERE type = ? ORDER BY RANDOM() LIMIT ?",
+                    (qtype, n + len(seen)),
+                ).fetchall()
+                for (qid,) in rows:
+                    if len(picked) >= n:
+                        break
+                    if qid not in seen:
+                        seen.add(qid)
+                        picked.append(qid)
+        return picked
+
+    def sample(self, qtype, n, exclude=()):
+        return self.fetch_many(self.sample_ids(qtype, n, exclude))
@@ -1,14 +1,17 @@
 import asyncio
 from utils.responses import get_response
+from bot.answer_matcher import AnswerMatcher
+from bot.roster import TEAMS
 from utils.leader_utils import taunt_lowest_leader
 
 class DoomQuestion:
-    def __init__(self, question, correct_answer, alt_answers=None):
+    def __init__(self, question, correct_answer, alt_answers=None, max_typos=0):
         self.question = question
-        self.correct_answer = correct_answer.lower()
-        self.alt_answers = [ans.lower() for ans in (alt_answers or [])]
+        self.correct_answer = correct_answer
+        self.alt_answers = list(alt_answers or [])
+        self.matcher = AnswerMatcher(correct_answer, self.alt_answers, max_typos)
 
-    async def ask(self, channel, bot, leaders, teams, points):
+    async def ask(self, channel, bot, roster, points):
         await channel.send("سؤال DOOM! القادة فقط يقررون... هل يقبلون التحدي؟")
         await channel.send("رد بـ 1 لقبول التحدي، أو 2 لرفضه خلال 15 ثانية.")
 
@@ -18,18 +21,18 @@ class DoomQuestion:
         def check_decision(msg):
             user = msg.author.name
             content = msg.content.strip()
-            if user in leaders.values() and user not in answered:
+            if roster.is_leader(user) and user not in answered:
                 answered.append(user)
                 if content == "1":
                     accepted_leaders.append(user)
             return False
 
-        await bot.wait_for_responses(15, check_decision)
+        await bot.wait_for_responses(15, check_decision, channel=channel, users=roster.leaders.values())
 
         if not accepted_leaders:
             await channel.send("كل الليدرات رفضوا سؤال Doom… تم تجاوز الجولة.")
-            await end_team_game(leaders, teams, points, channel)
-            return points
+            await end_team_game(roster, points, channel)
+            return
 
         if len(accepted_leaders) == 1:
             leader = accepted_leaders[0]
@@ -37,23 +40,19 @@ class DoomQuestion:
             await channel.send(f"السؤال: {self.question} (10 ثواني!)")
 
             def check_answer(msg):
-                if msg.author.name == leader:
-                    response = msg.content.strip().lower()
-                    all_answers = [self.correct_answer] + self.alt_answers
-                    return response in all_answers
-                return False
+                return msg.author.name == leader and self.matcher.matches(msg.content)
 
             try:
-                await bot.wait_for_message(10, check_answer)
+                await bot.wait_for_message(10, check_answer, channel=channel, users=[leader])
                 await channel.send(f"{leader} جاوب صح! نقاط فريقه تتضاعف.")
-                team = "أزرق" if leader in teams["أزرق"] else "أحمر"
-                for player in teams[team]:
-                    points[player] *= 2
+                team = roster.team_of(leader)
+                for player in roster[team]:
+                    points.multiply(player, 2, "doom")
             except asyncio.TimeoutError:
                 await channel.send(f"{leader} ما جاوب في الوقت المحدد! نقاط فريقه صارت صفر.")
-                team = "أزرق" if leader in teams["أزرق"] else "أحمر"
-                for player in teams[team]:
-                    points[player] = 0
+                team = roster.team_of(leader)
+                for player in roster[team]:
+                    points.set(player, 0, "doom")
                 msg = get_response("doomed_leader_responses", {"leader": leader})
                 if msg:
                     await channel.send(msg)
@@ -68,64 +67,58 @@ class DoomQuestion:
             def check_any(msg):
                 nonlocal answered_by, correct
                 user = msg.author.name
-                response = msg.content.strip().lower()
-                all_answers = [self.correct_answer] + self.alt_answers
-                if user in leaders.values() and answered_by is None:
+                if roster.is_leader(user) and answered_by is None:
                     answered_by = user
-                    correct = response in all_answers
+                    correct = self.matcher.matches(msg.content)
                 return False
 
-            await bot.wait_for_responses(10, check_any)
+            await bot.wait_for_responses(10, check_any, channel=channel, users=roster.leaders.values())
 
             if not answered_by:
                 await channel.send("ما جاوب أحد… الفريقين خسروا!")
                 for player in points:
-                    points[player] = 0
-                await end_team_game(leaders, teams, points, channel)
-                return points
+                    points.set(player, 0, "doom")
+                await end_team_game(roster, points, channel)
+                return
 
             winner_leader = answered_by
-            loser_leader = [l for l in leaders.values() if l != winner_leader][0]
-
-            winner_team = "أزرق" if winner_leader in teams["أزرق"] else "أحمر"
-            loser_team = "أحمر" if winner_team == "أزرق" else "أزرق"
+            winner_team = roster.team_of(winner_leader)
+            loser_team = roster.opponent(winner_team)
+            loser_leader = roster.leader_of(loser_team)
 
             if not correct:
                 await channel.send(f"{winner_leader} جاوب خطأ! فريقه خسر الجولة.")
-                for player in teams[winner_team]:
-                    points[player] = 0
+                for player in roster[winner_team]:
+                    points.set(player, 0, "doom")
                 msg = get_response("doomed_leader_responses", {"leader": winner_leader})
                 if msg:
                     await channel.send(msg)
             else:
-                score_winner = sum(points.get(p, 0) for p in teams[winner_team])
-                score_loser = sum(points.get(p, 0) for p in teams[loser_team])
+                score_winner = points.team_total(winner_team)
+                score_loser = points.team_total(loser_team)
 
                 if score_winner > score_loser:
-                    for player in teams[winner_team]:
-                        points[player] *= 2
+                    for player in roster[winner_team]:
+                        points.multiply(player, 2, "doom")
                     await channel.send(f"{winner_leader} جاوب صح وفريقه تفوق بالنقاط! الفريق الثاني خسر الجولة.")
-                    for player in teams[loser_team]:
-                        points[player] = 0
+                    for player in roster[loser_team]:
+                        points.set(player, 0, "doom")
                     msg = get_response("doomed_leader_responses", {"leader": loser_leader})
                     if msg:
                         await channel.send(msg)
                 else:
                     await channel.send(f"{winner_leader} جاوب صح لكن فريقه أضعف بالنقاط! يخسر الجولة.")
-                    for player in teams[winner_team]:
-                        points[player] = 0
+                    for player in roster[winner_team]:
+                        points.set(player, 0, "doom")
                     msg = get_response("doomed_leader_responses", {"leader": winner_leader})
                     if msg:
                         await channel.send(msg)
 
-        await end_team_game(leaders, teams, points, channel)
-        return points
+        await end_team_game(roster, points, channel)
 
 
-async def end_team_game(leaders, teams, points, channel):
-    team_scores = {"أزرق": 0, "أحمر": 0}
-    for team in teams:
-        team_scores[team] = sum(points.get(player, 0) for player in teams[team])
+async def end_team_game(roster, points, channel):
+    team_scores = {team: points.team_total(team) for team in TEAMS}
 
     winning_team = max(team_scores, key=team_scores.get)
     losing_team = min(team_scores, key=team_scores.get)
@@ -139,12 +132,12 @@ async def end_team_game(leaders, teams, points, channel):
         await channel.send(lose_msg)
 
     # التحقق إذا القائد أضعف نقاط
-    for team, leader in leaders.items():
-        team_points = {p: points.get(p, 0) for p in teams[team]}
+    for team, leader in roster.leaders.items():
+        team_points = {p: points.get(p, 0) for p in roster.active(team)}
         if leader in team_points:
             if team_points[leader] == min(team_points.values()):
                 msg = get_response("weak_leader_responses", {"leader": leader})
                 if msg:
                     await channel.send(msg)
 
-    await taunt_lowest_leader(leaders, points, channel)
+    await taunt_lowest_leader(roster.leaders, points, channel)
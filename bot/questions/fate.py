@@ -1,9 +1,10 @@
 from utils.responses import get_response
+from bot.answer_matcher import AnswerMatcher
 
 class TestOfFate:
     def __init__(self, questions_and_answers):
         self.questions = [
-            (q["question"], q["answer"].lower(), [a.lower() for a in q.get("alt_answers", [])])
+            (q["question"], q["answer"], AnswerMatcher.from_entry(q, "Fate"))
             for q in questions_and_answers
         ]
 
@@ -12,28 +13,26 @@ class TestOfFate:
 
         scores = {player: 0 for player in players}
 
-        for i, (question, answer, alt_answers) in enumerate(self.questions[:5]):
+        for i, (question, answer, matcher) in enumerate(self.questions[:5]):
             await channel.send(f"سؤال {i+1}: {question} (10 ثواني!)")
             answered = set()
 
             def check_answer(msg):
                 user = msg.author.name
-                response = msg.content.strip().lower()
-                all_answers = [answer] + alt_answers
-                if user in players and user not in answered:
+                if user in scores and user not in answered:
                     answered.add(user)
-                    if response in all_answers:
+                    if matcher.matches(msg.content):
                         scores[user] += 10
                     else:
                         scores[user] -= 5
                 return False
 
-            await bot.wait_for_responses(10, check_answer)
+            await bot.wait_for_responses(10, check_answer, channel=channel, users=players)
             await channel.send(f"الإجابة الصحيحة كانت: {answer}")
 
         # تحديث النقاط الإجمالية
         for player, score in scores.items():
-            points[player] = points.get(player, 0) + score
+            points.add(player, score, "fate")
 
         results = "\n".join(f"{p}: {points[p]} نقطة" for p in players)
         await channel.send("نتائج اختبار المصير:\n" + results)
@@ -44,5 +43,3 @@ class TestOfFate:
                 msg = get_response("below_zero_responses", {"player": player})
                 if msg:
                     await channel.send(msg)
-
-        return points
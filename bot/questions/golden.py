@@ -2,13 +2,16 @@
 
 import time
 
+from bot.answer_matcher import AnswerMatcher
+
 class GoldenQuestion:
-    def __init__(self, question, correct_answer, alt_answers=None):
+    def __init__(self, question, correct_answer, alt_answers=None, max_typos=0):
         self.question = question
-        self.correct_answer = correct_answer.lower()
-        self.alt_answers = [ans.lower() for ans in (alt_answers or [])]
+        self.correct_answer = correct_answer
+        self.alt_answers = list(alt_answers or [])
+        self.matcher = AnswerMatcher(correct_answer, self.alt_answers, max_typos)
 
-    async def ask(self, channel, bot, game_mode, teams=None, points=None):
+    async def ask(self, channel, bot, game_mode, roster=None, points=None):
         await channel.send("استعدوا... هذا هو السؤال الذهبي!")
         await channel.send(f"السؤال: {self.question} (عندكم 10 ثوانٍ للإجابة!)")
         start_time = time.time()
@@ -17,13 +20,12 @@ class GoldenQuestion:
         def check_response(msg):
             nonlocal winner
             user = msg.author.name
-            response = msg.content.strip().lower()
-            all_answers = [self.correct_answer] + self.alt_answers
-            if winner is None and response in all_answers:
+            if winner is None and self.matcher.matches(msg.content):
                 winner = user
             return False
 
-        await bot.wait_for_responses(10, check_response)
+        users = roster.active() if roster is not None else None
+        await bot.wait_for_responses(10, check_response, channel=channel, users=users)
 
         if not winner:
             await channel.send("خلص الوقت! ما حد جاوب.")
@@ -31,11 +33,10 @@ class GoldenQuestion:
 
         await channel.send(f"{winner} جاوب صح! فريقه حصل على 100 نقطة.")
 
-        if game_mode == "تيم" and teams and points:
-            team = "أزرق" if winner in teams["أزرق"] else "أحمر"
-            share = 100 // len(teams[team])
-            for player in teams[team]:
-                points[player] = points.get(player, 0) + share
-            return points
+        if game_mode == "تيم" and roster is not None:
+            members = roster.active(roster.team_of(winner))
+            share = 100 // len(members)
+            for player in members:
+                points.add(player, share, "golden")
         else:
-            return {winner: 100}
+            points.add(winner, 100, "golden")
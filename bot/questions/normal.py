@@ -1,29 +1,27 @@
 # bot/questions/normal.py
 
-import time
+from bot.answer_matcher import AnswerMatcher
+from bot.answer_clock import AnswerClock
 
 class NormalQuestion:
-    def __init__(self, question, correct_answer, alt_answers=None):
+    def __init__(self, question, correct_answer, alt_answers=None, max_typos=0):
         self.question = question
-        self.correct_answer = correct_answer.lower()
-        self.alt_answers = [ans.lower() for ans in (alt_answers or [])]
+        self.correct_answer = correct_answer
+        self.alt_answers = list(alt_answers or [])
+        self.matcher = AnswerMatcher(correct_answer, self.alt_answers, max_typos)
         self.answers = {}
 
-    async def ask(self, channel, bot, mode="solo"):
+    async def ask(self, channel, bot, mode="solo", drift=None, users=None):
         await channel.send(f"السؤال: {self.question} (10 ثوانٍ للإجابة!)")
-        start_time = time.time()
+        clock = AnswerClock(drift)
 
         def check_response(msg):
             user = msg.author.name
-            response = msg.content.strip().lower()
-            all_answers = [self.correct_answer] + self.alt_answers
-
-            if user not in self.answers and response in all_answers:
-                response_time = time.time() - start_time
-                self.answers[user] = response_time
+            if user not in self.answers and self.matcher.matches(msg.content):
+                self.answers[user] = clock.elapsed(msg)
             return False
 
-        await bot.wait_for_responses(10, check_response)
+        await bot.wait_for_responses(10, check_response, channel=channel, users=users)
 
         player_scores = {}
         for player, response_time in self.answers.items():
@@ -36,11 +34,9 @@ class NormalQuestion:
 
 
 class TeamNormalQuestion(NormalQuestion):
-    async def ask(self, channel, bot, teams, points):
-        player_scores = await super().ask(channel, bot, mode="team")
+    async def ask(self, channel, bot, roster, points, drift=None):
+        player_scores = await super().ask(channel, bot, mode="team", drift=drift, users=roster.active())
 
         for player, score in player_scores.items():
-            if player in teams["أزرق"]:
-                points[player] = points.get(player, 0) + score
-            elif player in teams["أحمر"]:
-                points[player] = points.get(player, 0) + score
+            if roster.is_active(player):
+                points.add(player, score, "normal")
@@ -1,35 +1,39 @@
 import asyncio
 import random
 from utils.responses import get_response
+from bot.answer_matcher import AnswerMatcher
+from bot.roster import BLUE, RED
 
 class SabotageQuestion:
-    def __init__(self, question, correct_answer, alt_answers=None):
+    def __init__(self, question, correct_answer, alt_answers=None, max_typos=0):
         self.question = question
-        self.correct_answer = correct_answer.lower()
-        self.alt_answers = [ans.lower() for ans in (alt_answers or [])]
+        self.correct_answer = correct_answer
+        self.alt_answers = list(alt_answers or [])
+        self.matcher = AnswerMatcher(correct_answer, self.alt_answers, max_typos)
 
-    async def ask(self, channel, bot, teams, leaders, points, game_mode):
+    async def ask(self, channel, bot, roster, points, game_mode):
         await channel.send("كل فريق يكتب منشن لواحد من الخصم يبغى يطرده (ماعدا القائد)، معكم 15 ثانية!")
 
-        mentions = {"أزرق": None, "أحمر": None}
+        mentions = {BLUE: None, RED: None}
         individual_mentions = {}
 
         def check_mentions(msg):
             user = msg.author.name
-            content = msg.content
+            mentioned = [word[1:] for word in msg.content.split() if word.startswith("@")]
+            if not mentioned:
+                return False
+            target = mentioned[0]
             if game_mode == "تيم":
-                if user in teams["أزرق"] and not mentions["أزرق"]:
-                    if msg.mentions and msg.mentions[0].name in teams["أحمر"] and msg.mentions[0].name != leaders["أحمر"]:
-                        mentions["أزرق"] = msg.mentions[0].name
-                elif user in teams["أحمر"] and not mentions["أحمر"]:
-                    if msg.mentions and msg.mentions[0].name in teams["أزرق"] and msg.mentions[0].name != leaders["أزرق"]:
-                        mentions["أحمر"] = msg.mentions[0].name
+                team = roster.team_of(user)
+                if team in mentions and not mentions[team]:
+                    if roster.team_of(target) == roster.opponent(team) and not roster.is_leader(target):
+                        mentions[team] = target
             elif game_mode == "تحدي":
-                if msg.mentions and msg.mentions[0].name in points:
-                    individual_mentions[user] = msg.mentions[0].name
+                if roster.is_active(target):
+                    individual_mentions[user] = target
             return False
 
-        await bot.wait_for_responses(15, check_mentions)
+        await bot.wait_for_responses(15, check_mentions, channel=channel, users=roster.active())
 
         await channel.send("السؤال الجاي للجميع، أول واحد يجاوب صح ينفذ اختياره:")
         await channel.send(f"{self.question} (10 ثواني!)")
@@ -38,38 +42,29 @@ class SabotageQuestion:
 
         def check_response(msg):
             nonlocal winner
-            response = msg.content.strip().lower()
-            if response in [self.correct_answer] + self.alt_answers and msg.author.name in points and winner is None:
+            if winner is None and roster.is_active(msg.author.name) and self.matcher.matches(msg.content):
                 winner = msg.author.name
             return False
 
-        await bot.wait_for_responses(10, check_response)
+        await bot.wait_for_responses(10, check_response, channel=channel, users=roster.active())
 
         if not winner:
             await channel.send("ما جاوب أحد! ما فيه طرد.")
-            return points
+            return
 
+        target = None
         if game_mode == "تيم":
-            team = "أزرق" if winner in teams["أزرق"] else "أحمر"
-            target = mentions[team]
+            target = mentions.get(roster.team_of(winner))
         elif game_mode == "تحدي":
             target = individual_mentions.get(winner)
 
-        if not target or target in [leaders.get("أزرق"), leaders.get("أحمر")]:
+        if not target or roster.is_leader(target):
             await channel.send("ما تقدر تطرد القائد أو ما تم تحديد ضحية بشكل صحيح.")
-            return points
-
-        # ✅✅✅ إضافة هنا فقط:
-        if hasattr(bot, 'engine') and hasattr(bot.engine, 'kicked_players'):
-            bot.engine.kicked_players.append(target)
+            return
 
+        points.kick(target, "sabotage")
         await channel.send(f"{target} تم طرده من اللعبة.")
 
         msg = get_response("kicked_responses", {"player": target})
         if msg:
             await channel.send(msg)
-
-        if target in points:
-            del points[target]
-
-        return points
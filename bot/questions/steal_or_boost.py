@@ -1,14 +1,16 @@
 import asyncio
 import random
 from utils.responses import get_response
+from bot.answer_matcher import AnswerMatcher
 
 class StealOrBoostTeamQuestion:
-    def __init__(self, question, correct_answer, alt_answers=None):
+    def __init__(self, question, correct_answer, alt_answers=None, max_typos=0):
         self.question = question
-        self.correct_answer = correct_answer.lower()
-        self.alt_answers = [ans.lower() for ans in (alt_answers or [])]
+        self.correct_answer = correct_answer
+        self.alt_answers = list(alt_answers or [])
+        self.matcher = AnswerMatcher(correct_answer, self.alt_answers, max_typos)
 
-    async def ask(self, channel, bot, teams, leaders, points):
+    async def ask(self, channel, bot, roster, points):
         await channel.send("اكتب زرف أو زود للتسجيل! عندكم 10 ثواني!")
 
         decisions = {}
@@ -16,12 +18,12 @@ class StealOrBoostTeamQuestion:
         def decision_check(msg):
             user = msg.author.name
             choice = msg.content.strip().lower()
-            if user in teams['أزرق'] + teams['أحمر'] and user not in decisions:
+            if roster.is_active(user) and user not in decisions:
                 if choice in ["زرف", "زود"]:
                     decisions[user] = choice
             return False
 
-        await bot.wait_for_responses(10, decision_check)
+        await bot.wait_for_responses(10, decision_check, channel=channel, users=roster.active())
 
         await channel.send(f"السؤال: {self.question} (10 ثواني للإجابة!)")
 
@@ -30,26 +32,26 @@ class StealOrBoostTeamQuestion:
         def answer_check(msg):
             nonlocal correct_user
             user = msg.author.name
-            content = msg.content.strip().lower()
-            if user in decisions and content in [self.correct_answer] + self.alt_answers:
+            if user in decisions and self.matcher.matches(msg.content):
                 correct_user = user
             return False
 
-        await bot.wait_for_responses(10, answer_check)
+        await bot.wait_for_responses(10, answer_check, channel=channel, users=list(decisions))
 
         if not correct_user:
             await channel.send("ما حد جاوب صح!")
-            return points
+            return
 
         action = decisions[correct_user]
-        user_team = "أزرق" if correct_user in teams["أزرق"] else "أحمر"
-        opponent_team = "أحمر" if user_team == "أزرق" else "أزرق"
+        user_team = roster.team_of(correct_user)
+        opponent_team = roster.opponent(user_team)
+        leader = roster.leader_of(user_team)
 
         if action == "زود":
             bonus = random.randint(10, 50)
-            points[correct_user] = points.get(correct_user, 0) + bonus
+            points.add(correct_user, bonus, "boost")
             await channel.send(f"{correct_user} اختار زود! وتمت إضافة {bonus} نقطة له.")
-            return points
+            return
 
         await channel.send(f"{correct_user} اختار زرف! منشن لاعب من الفريق {opponent_team} للسرقة.")
 
@@ -59,54 +61,55 @@ class StealOrBoostTeamQuestion:
             nonlocal target_player
             user = msg.author.name
             if (
-                (correct_user == leaders[user_team] and user == correct_user)
-                or (correct_user != leaders[user_team] and user == leaders[user_team])
+                (correct_user == leader and user == correct_user)
+                or (correct_user != leader and user == leader)
             ):
                 mentions = [word[1:] for word in msg.content.split() if word.startswith("@")]
                 for m in mentions:
-                    if m in teams[opponent_team]:
+                    if roster.team_of(m) == opponent_team and roster.is_active(m):
                         target_player = m
                         return True
             return False
 
-        await bot.wait_for_responses(10, mention_check)
+        await bot.wait_for_responses(10, mention_check, channel=channel, users=[correct_user, leader])
 
         if not target_player:
             await channel.send("ما تم اختيار لاعب للسرقة!")
-            return points
+            return
 
         stolen = points.get(target_player, 0)
-        points[target_player] = 0
-        for p in teams[user_team]:
-            points[p] = points.get(p, 0) + stolen // len(teams[user_team])
+        points.set(target_player, 0, "stolen")
+        members = roster.active(user_team)
+        for p in members:
+            points.add(p, stolen // len(members), "steal")
 
         msg = get_response("stolen_responses", {"player": target_player})
         if msg:
             await channel.send(msg)
 
-        return points
-
 
 class ChallengeStealOrBoostQuestion:
-    def __init__(self, question, correct_answer, alt_answers=None):
+    def __init__(self, question, correct_answer, alt_answers=None, max_typos=0):
         self.question = question
-        self.correct_answer = correct_answer.lower()
-        self.alt_answers = [ans.lower() for ans in (alt_answers or [])]
+        self.correct_answer = correct_answer
+        self.alt_answers = list(alt_answers or [])
+        self.matcher = AnswerMatcher(correct_answer, self.alt_answers, max_typos)
 
     async def ask(self, channel, bot, players, points):
         await channel.send("اكتب زرف أو زود للتسجيل! عندكم 10 ثواني!")
 
         decisions = {}
+        allowed = set(players)
 
         def decision_check(msg):
             user = msg.author.name
             choice = msg.content.strip().lower()
-            if user in players and user not in decisions:
+            if user in allowed and user not in decisions:
                 if choice in ["زرف", "زود"]:
                     decisions[user] = choice
             return False
 
-        await bot.wait_for_responses(10, decision_check)
+        await bot.wait_for_responses(10, decision_check, channel=channel, users=players)
 
         await channel.send(f"السؤال: {self.question} (10 ثواني للإجابة!)")
 
@@ -114,39 +117,36 @@ class ChallengeStealOrBoostQuestion:
 
         def answer_check(msg):
             user = msg.author.name
-            content = msg.content.strip().lower()
-            if user in decisions and content in [self.correct_answer] + self.alt_answers:
+            if user in decisions and self.matcher.matches(msg.content):
                 nonlocal correct_user
                 correct_user = user
             return False
 
-        await bot.wait_for_responses(10, answer_check)
+        await bot.wait_for_responses(10, answer_check, channel=channel, users=list(decisions))
 
         if not correct_user:
             await channel.send("ما حد جاوب صح!")
-            return points
+            return
 
         action = decisions[correct_user]
 
         if action == "زود":
             bonus = random.randint(10, 50)
-            points[correct_user] = points.get(correct_user, 0) + bonus
+            points.add(correct_user, bonus, "boost")
             await channel.send(f"{correct_user} اختار زود! وتمت إضافة {bonus} نقطة له.")
-            return points
+            return
 
         # زرف - عشوائي
         potential_targets = [p for p in players if p != correct_user]
         if not potential_targets:
             await channel.send("ما فيه أحد تسرقه!")
-            return points
+            return
 
         target = random.choice(potential_targets)
         stolen = points.get(target, 0)
-        points[target] = 0
-        points[correct_user] = points.get(correct_user, 0) + stolen
+        points.set(target, 0, "stolen")
+        points.add(correct_user, stolen, "steal")
 
         msg = get_response("stolen_responses", {"player": target})
         if msg:
             await channel.send(msg)
-
-        return points
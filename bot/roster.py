@@ -0,0 +1,80 @@
+BLUE = "أزرق"
+RED = "أحمر"
+TEAMS = (BLUE, RED)
+
+
+class Roster:
+    """
+    سجل اللاعبين في لعبة وحدة: مين مسجل، بأي فريق، مين الليدر، ومين انطرد.
+    كل الفحوصات O(1) بدل البحث داخل القوائم.
+    اللاعب في وضع السولو أو التحدي يتسجل بدون فريق (team=None).
+    """
+
+    def __init__(self):
+        self._team_of = {}
+        # فريق -> اللاعبين بترتيب التسجيل (dict كـ set مرتب)
+        self._members = {team: {} for team in (None, *TEAMS)}
+        self.leaders = {team: None for team in TEAMS}
+        self.kicked = set()
+
+    def add(self, user, team=None):
+        if user in self._team_of:
+            return False
+        self._team_of[user] = team
+        self._members[team][user] = None
+        return True
+
+    def __contains__(self, user):
+        return user in self._team_of
+
+    def __len__(self):
+        return len(self._team_of)
+
+    def __iter__(self):
+        return iter(self._team_of)
+
+    def __getitem__(self, team):
+        return self._members[team].keys()
+
+    @property
+    def players(self):
+        return list(self._team_of)
+
+    def team_of(self, user):
+        return self._team_of.get(user)
+
+    @staticmethod
+    def opponent(team):
+        return RED if team == BLUE else BLUE
+
+    def set_leader(self, team, user):
+        self.leaders[team] = user
+
+    def leader_of(self, team):
+        return self.leaders.get(team)
+
+    def is_leader(self, user):
+        team = self._team_of.get(user)
+        return team is not None and self.leaders.get(team) == user
+
+    def kick(self, user):
+        if user in self._team_of:
+            self.kicked.add(user)
+
+    def is_active(self, user):
+        return user in self._team_of and user not in self.kicked
+
+    def active(self, team=None):
+        members = self._members[team] if team is not None else self._team_of
+        return [user for user in members if user not in self.kicked]
+
+    def teams(self):
+        return {team: list(self._members[team]) for team in TEAMS}
+
+    def clear(self):
+        self._team_of.clear()
+        for members in self._members.values():
+            members.clear()
+        for team in TEAMS:
+            self.leaders[team] = None
+        self.kicked.clear()
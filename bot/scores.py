@@ -0,0 +1,103 @@
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict, namedtuple
+
+# questions: ids أسئلة المرحلة في البنك، ثابتة حتى لو السؤال تعدل بعدين
+ScoreEvent = namedtuple(
+    "ScoreEvent", ["player", "delta", "total", "reason", "phase", "at", "questions"], defaults=[()]
+)
+
+
+class ScoreLedger:
+    """
+    سجل نقاط اللعبة: كل تغيير ينحفظ كحدث (اللاعب، الفرق، السبب، المرحلة)،
+    ومجموع كل لاعب وكل فريق والترتيب يتحدثون مع كل حدث بدل ما نعيد الحساب من الصفر.
+    يتقرى مثل dict عادي (get و [] و in)، بس التعديل لازم يكون عن طريق add/set/multiply/kick.
+    """
+
+    def __init__(self, roster=None):
+        self.roster = roster
+        self.phase = None
+        self.questions = ()
+        self.events = []
+        self._totals = {}
+        self._team_totals = defaultdict(int)
+        # (-النقاط، اللاعب) مرتبة، أول عنصر هو الأعلى
+        self._ranking = []
+
+    def _team_of(self, player):
+        return self.roster.team_of(player) if self.roster is not None else None
+
+    def _is_kicked(self, player):
+        return self.roster is not None and player in self.roster.kicked
+
+    def add(self, player, delta, reason):
+        if not delta or self._is_kicked(player):
+            return self.get(player)
+        old = self._totals.get(player)
+        new = (old or 0) + delta
+        if old is not None:
+            del self._ranking[bisect_left(self._ranking, (-old, player))]
+        insort(self._ranking, (-new, player))
+        self._totals[player] = new
+        self._team_totals[self._team_of(player)] += delta
+        self.events.append(ScoreEvent(player, delta, new, reason, self.phase, time.time(), self.questions))
+        return new
+
+    def set(self, player, value, reason):
+        return self.add(player, value - self.get(player), reason)
+
+    def multiply(self, player, factor, reason):
+        current = self.get(player)
+        return self.add(player, current * factor - current, reason)
+
+    def kick(self, player, reason):
+        # نقاط المطرود تنمسح، وبعدها أي نقاط له ما تنحسب
+        self.set(player, 0, reason)
+        if self.roster is not None:
+            self.roster.kick(player)
+
+    def get(self, player, default=0):
+        return self._totals.get(player, default)
+
+    def __getitem__(self, player):
+        return self._totals.get(player, 0)
+
+    def __contains__(self, player):
+        return player in self._totals
+
+    def __iter__(self):
+        return iter(list(self._totals))
+
+    def __len__(self):
+        return len(self._totals)
+
+    def items(self):
+        return self._totals.items()
+
+    def team_total(self, team):
+        return self._team_totals.get(team, 0)
+
+    def top(self, n=None):
+        ranking = ((player, -score) for score, player in self._ranking if not self._is_kicked(player))
+        if n is None:
+            return list(ranking)
+        result = []
+        for entry in ranking:
+            if len(result) >= n:
+                break
+            result.append(entry)
+        return result
+
+    def history(self, player=None):
+        if player is None:
+            return list(self.events)
+        return [e for e in self.events if e.player == player]
+
+    def clear(self):
+        self.phase = None
+        self.questions = ()
+        self.events = []
+        self._totals.clear()
+        self._team_totals.clear()
+        self._ranking = []
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from collections import OrderedDict
+
+from bot.engine import WiduxEngine
+
+# مدة الخمول (بالثواني) اللي بعدها تنحذف جلسة القناة من الذاكرة
+IDLE_TTL = 1800
+SWEEP_INTERVAL = 60
+
+
+class SessionRegistry:
+    """
+    سجل جلسات اللعب، كل قناة لها WiduxEngine خاص فيها.
+    الجلسة تنشأ أول ما توصل رسالة من القناة، وتنحذف إذا خملت أكثر من idle_ttl
+    وما فيها لعبة شغالة.
+    """
+
+    def __init__(self, bot, idle_ttl=IDLE_TTL, factory=None):
+        self.bot = bot
+        self.idle_ttl = idle_ttl
+        self.factory = factory or (lambda channel: WiduxEngine(bot, channel))
+        # الترتيب من الأقدم نشاطًا للأحدث، عشان الحذف يوقف عند أول جلسة نشطة
+        self._sessions = OrderedDict()
+        self._last_seen = {}
+        self.evicted = 0
+
+    @staticmethod
+    def _key(channel):
+        name = getattr(channel, "name", channel)
+        return name.lower()
+
+    def get(self, channel):
+        key = self._key(channel)
+        session = self._sessions.get(key)
+        if session is None:
+            session = self.factory(key)
+            self._sessions[key] = session
+        else:
+            self._sessions.move_to_end(key)
+        self._last_seen[key] = time.monotonic()
+        return session
+
+    def peek(self, channel):
+        return self._sessions.get(self._key(channel))
+
+    def __contains__(self, channel):
+        return self._key(channel) in self._sessions
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __iter__(self):
+        return iter(list(self._sessions.items()))
+
+    def evict_idle(self, now=None):
+        now = time.monotonic() if now is None else now
+        evicted = []
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if now - self._last_seen[key] < self.idle_ttl:
+                break
+            if session.is_active:
+                # لعبة شغالة بدون شات، نرجعها لآخر الطابور ونكمل
+                self._sessions.move_to_end(key)
+                self._last_seen[key] = now
+                continue
+            del self._sessions[key]
+            del self._last_seen[key]
+            evicted.append(key)
+        self.evicted += len(evicted)
+        return evicted
+
+    async def close(self, channel):
+        key = self._key(channel)
+        session = self._sessions.pop(key, None)
+        self._last_seen.pop(key, None)
+        if session is not None:
+            await session.cancel_game()
+
+    async def sweep_loop(self, interval=SWEEP_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.evict_idle()
+            except Exception as e:
+                print(f"[خطأ تنظيف الجلسات] {e}")
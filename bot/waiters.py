@@ -0,0 +1,140 @@
+import asyncio
+import time
+from collections import defaultdict, deque
+
+# أي قناة (للانتظار اللي ما حدد قناة)
+ANY_CHANNEL = "*"
+
+
+class Waiter:
+    def __init__(self, channel, check, users=None):
+        self.channel = channel
+        self.check = check
+        self.users = frozenset(users) if users is not None else None
+        self.label = getattr(check, "__qualname__", repr(check))
+        self.future = asyncio.get_running_loop().create_future()
+        self.messages = 0
+        self.callback_time = 0.0
+        self.started = time.monotonic()
+
+    def stats(self):
+        return {
+            "channel": self.channel,
+            "check": self.label,
+            "messages": self.messages,
+            "callback_ms": round(self.callback_time * 1000, 3),
+            "users": len(self.users) if self.users is not None else None,
+            "age": round(time.monotonic() - self.started, 3),
+        }
+
+
+class WaiterRegistry:
+    """
+    انتظار ردود الشات مفهرس بالقناة، وبالمستخدم إذا كان الانتظار لمجموعة لاعبين محددة.
+    كل رسالة توصل بس للـ checks اللي ممكن تهمها بدل ما نلف على كل الانتظارات المفتوحة.
+    """
+
+    def __init__(self, history=200):
+        # قناة -> الانتظارات المفتوحة لأي مستخدم (dict عشان نحافظ على الترتيب)
+        self._open = defaultdict(dict)
+        # قناة -> مستخدم -> الانتظارات الخاصة فيه
+        self._by_user = defaultdict(lambda: defaultdict(dict))
+        self.recent = deque(maxlen=history)
+        self.dispatched = 0
+
+    @staticmethod
+    def _channel_key(channel):
+        if channel is None:
+            return ANY_CHANNEL
+        return getattr(channel, "name", channel).lower()
+
+    def register(self, channel, check, users=None):
+        waiter = Waiter(self._channel_key(channel), check, users)
+        if waiter.users is None:
+            self._open[waiter.channel][waiter] = None
+        else:
+            bucket = self._by_user[waiter.channel]
+            for user in waiter.users:
+                bucket[user][waiter] = None
+        return waiter
+
+    def unregister(self, waiter):
+        if waiter.users is None:
+            bucket = self._open.get(waiter.channel)
+            if bucket is not None:
+                bucket.pop(waiter, None)
+                if not bucket:
+                    del self._open[waiter.channel]
+        else:
+            by_user = self._by_user.get(waiter.channel)
+            if by_user is not None:
+                for user in waiter.users:
+                    waiters = by_user.get(user)
+                    if waiters is not None:
+                        waiters.pop(waiter, None)
+                        if not waiters:
+                            del by_user[user]
+                if not by_user:
+                    del self._by_user[waiter.channel]
+        self.recent.append(waiter.stats())
+
+    def _candidates(self, channel, user):
+        found = []
+        for key in (channel, ANY_CHANNEL):
+            bucket = self._open.get(key)
+            if bucket:
+                found.extend(bucket)
+            by_user = self._by_user.get(key)
+            if by_user:
+                waiters = by_user.get(user)
+                if waiters:
+                    found.extend(waiters)
+        return found
+
+    def dispatch(self, message):
+        if message.author is None or message.channel is None:
+            return 0
+        channel = message.channel.name.lower()
+        candidates = self._candidates(channel, message.author.name)
+        for waiter in candidates:
+            if waiter.future.done():
+                continue
+            started = time.perf_counter()
+            try:
+                matched = waiter.check(message)
+            except Exception as e:
+                print(f"[خطأ في فحص الرد] {waiter.label}: {e}")
+                matched = False
+            waiter.callback_time += time.perf_counter() - started
+            waiter.messages += 1
+            if matched:
+                waiter.future.set_result(message)
+        self.dispatched += len(candidates)
+        return len(candidates)
+
+    async def wait(self, seconds, check, channel=None, users=None, raise_on_timeout=False):
+        waiter = self.register(channel, check, users)
+        try:
+            return await asyncio.wait_for(waiter.future, seconds)
+        except asyncio.TimeoutError:
+            if raise_on_timeout:
+                raise
+            return None
+        finally:
+            self.unregister(waiter)
+
+    def active(self):
+        waiters = set()
+        for bucket in self._open.values():
+            waiters.update(bucket)
+        for by_user in self._by_user.values():
+            for bucket in by_user.values():
+                waiters.update(bucket)
+        return [w.stats() for w in waiters]
+
+    def stats(self):
+        return {
+            "active": self.active(),
+            "recent": list(self.recent),
+            "dispatched": self.dispatched,
+        }
@@ -9,12 +9,16 @@ cursor = conn.cursor()
 cursor.execute("""
 CREATE TABLE IF NOT EXISTS questions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    type TEXT NOT NULL,
-    text TEXT NOT NULL,
+    question TEXT NOT NULL,
     correct_answer TEXT NOT NULL,
-    alternative_answers TEXT
+    alt_answers TEXT,
+    category TEXT,
+    type TEXT CHECK(type IN ('Normal', 'Golden', 'Steal', 'Sabotage', 'Doom', 'Fate')),
+    max_typos INTEGER
 )
 """)
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_type ON questions (type)")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_questions_category ON questions (category)")
 
 # إنشاء جدول ردود اللعبة
 cursor.execute("""
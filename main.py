@@ -1,28 +1,49 @@
 import asyncio
 from twitchio.ext import commands
-from settings_manager import BotSettings
+from settings_manager import current_settings, settings_cache
 from bot.mention_guard import MentionGuard
-from bot.engine import WiduxEngine
-
-# دالة لجلب الإعدادات المحدثة دائماً
+from bot.mention_store import MentionStore
+from bot.sessions import SessionRegistry
+from bot.waiters import WaiterRegistry
+from bot.leaderboard import Leaderboard
+from bot.question_manager import QuestionManager
+from bot.channel_config import ChannelConfigResolver
+from utils.config_feed import ConfigSubscriber, diff_keys
+
+# نسخة الإعدادات الحالية المشتركة في كل البوت (بدون قراءة من القرص كل مرة)
 def get_settings():
-    return BotSettings()
-
-# حماية المنشن
-mention_guard = MentionGuard()
-
-def setup_mention_guard():
-    settings = get_settings()
+    return current_settings()
+
+# حماية المنشن، وحالتها محفوظة في القاعدة المشتركة عشان تبقى بعد إعادة التشغيل
+mention_guard = MentionGuard(store=MentionStore())
+
+# مفاتيح الإعدادات اللي إذا تغيرت نعيد إعداد حماية المنشن
+MENTION_GUARD_KEYS = {
+    "mention_limit",
+    "mention_guard_duration",
+    "mention_guard_cooldown",
+    "mention_guard_warning_thresh",
+    "mention_guard_warn_msg",
+    "mention_guard_timeout_msg",
+    "mention_guard_window",
+    "general_roasts",
+    "special_responses",
+}
+
+def setup_mention_guard(settings=None):
+    if settings is None:
+        settings = get_settings()
     mention_guard.set_config(
-        limit=settings.get_setting("mention_limit"),
-        duration=settings.get_setting("mention_guard_duration"),
-        cooldown=settings.get_setting("mention_guard_cooldown"),
-        warning_thresh=settings.get_setting("mention_guard_warning_thresh"),
-        warn_msg=settings.get_setting("mention_guard_warn_msg"),
-        timeout_msg=settings.get_setting("mention_guard_timeout_msg"),
+        limit=settings.get("mention_limit"),
+        duration=settings.get("mention_guard_duration"),
+        cooldown=settings.get("mention_guard_cooldown"),
+        warning_thresh=settings.get("mention_guard_warning_thresh"),
+        warn_msg=settings.get("mention_guard_warn_msg"),
+        timeout_msg=settings.get("mention_guard_timeout_msg"),
+        window=settings.get("mention_guard_window"),
     )
-    mention_guard.general_roasts = settings.get_setting("general_roasts") or []
-    specials = settings.get_setting("special_responses") or {}
+    mention_guard.general_roasts = settings.get("general_roasts") or []
+    specials = settings.get("special_responses") or {}
     for user, responses in specials.items():
         mention_guard.add_special_responses(user.lower(), responses)
 
@@ -37,23 +58,45 @@ class WiduxBot(commands.Bot):
             prefix="!",
             initial_channels=[]
         )
-        self.engine = WiduxEngine(self)
+        self.panel_channels = []
+        # إعدادات كل قناة (العامة + القناة + الجلسة) محسوبة ومحفوظة
+        self.channel_config = ChannelConfigResolver()
+        self.config_feed = ConfigSubscriber(self.apply_config_event)
+        # أي تبديل لنسخة الإعدادات (من اللوحة أو تعديل الملف) يطبق المفاتيح اللي تغيرت بس
+        settings_cache.listeners.append(self.on_settings_changed)
+        # كل قناة لها جلسة لعب مستقلة
+        self.sessions = SessionRegistry(self)
+        self.waiters = WaiterRegistry()
+        self.leaderboard = Leaderboard()
+        self.question_bank = QuestionManager()
         self.last_channels = set()
+        # المزامنة تنطلب من أكثر من مكان (snapshot وتغيير الإعدادات)، فتمشي وحدة وحدة
+        self._sync_lock = asyncio.Lock()
+
+    @property
+    def config(self):
+        return get_settings()
 
     async def event_ready(self):
-        settings = get_settings()
-        print(f">>> البوت جاهز! اسمه: {settings.get_setting('bot_username')}")
-        asyncio.create_task(self.sync_channels_loop())
+        print(f">>> البوت جاهز! اسمه: {self.config.get('bot_username')}")
+        asyncio.create_task(self.question_bank.load_questions())
+        asyncio.create_task(self.sessions.sweep_loop())
+        asyncio.create_task(mention_guard.flush_loop())
+        # القنوات من الملف لين يوصل أول snapshot من اللوحة
+        await self.sync_channels()
+        asyncio.create_task(self.config_feed.run())
 
     async def event_message(self, message):
         if message.echo:
             return
 
         username = message.author.name.lower()
-        settings = get_settings()
+        bot_username = (self.config.get("bot_username") or "").lower()
 
-        if f"@{settings.get_setting('bot_username').lower()}" in message.content.lower():
-            result = mention_guard.handle_mention(username)
+        if bot_username and f"@{bot_username}" in message.content.lower():
+            channel_name = message.channel.name
+            await mention_guard.restore(username, channel_name)
+            result = mention_guard.handle_mention(username, self.channel_config.get(channel_name), channel=channel_name)
             if result["action"] == "warn":
                 await message.channel.send(result["message"])
             elif result["action"] == "timeout":
@@ -62,31 +105,89 @@ class WiduxBot(commands.Bot):
             elif result["action"] == "roast":
                 await message.channel.send(result["message"])
 
-        await self.engine.handle_message(message)
-
-    async def sync_channels_loop(self):
-        await self.wait_for_ready()
-        while True:
+        self.waiters.dispatch(message)
+        await self.sessions.get(message.channel).handle_message(message)
+
+    async def close(self):
+        # آخر دفعة من حماية المنشن قبل ما يطفي
+        await mention_guard.flush()
+        await super().close()
+
+    async def wait_for_responses(self, seconds, check, channel=None, users=None):
+        """
+        يمرر رسائل الشات على check لمدة seconds، ويوقف بدري إذا check رجع True.
+        يرجع الرسالة اللي وقفت الانتظار أو None.
+        """
+        return await self.waiters.wait(seconds, check, channel=channel, users=users)
+
+    async def wait_for_message(self, seconds, check, channel=None, users=None):
+        """
+        ينتظر أول رسالة يرجع لها check قيمة True، ويرمي asyncio.TimeoutError إذا خلص الوقت.
+        """
+        return await self.waiters.wait(seconds, check, channel=channel, users=users, raise_on_timeout=True)
+
+    async def apply_config_event(self, event):
+        """
+        يطبق حدث من سيرفر اللوحة: الإعدادات تتبدل بنسخة جديدة فيها المفاتيح اللي تغيرت،
+        و on_settings_changed يعيد إعداد اللي تأثر بس.
+        """
+        if event.get("snapshot"):
+            documents = event["documents"]
+            if "settings" in documents:
+                settings_cache.replace(documents["settings"])
+            channels = documents.get("channels", {}).get("channels")
+            if channels is not None:
+                self.panel_channels = channels
+                await self.sync_channels()
+
+        elif event["document"] == "settings":
+            data = dict(self.config.data)
+            data.update(event["changes"])
+            for key in event["removed"]:
+                data.pop(key, None)
+            settings_cache.replace(data)
+
+        elif event["document"] == "channels":
+            self.panel_channels = event["changes"].get("channels", [])
+            await self.sync_channels()
+
+    def on_settings_changed(self, old, new):
+        changes, removed = diff_keys(old.data if old else {}, new.data)
+        changed = set(changes) | set(removed)
+        if changed & MENTION_GUARD_KEYS:
+            setup_mention_guard(new)
+        if "channels" in changed:
             try:
-                settings = get_settings()
-                current = set(settings.get_setting("channels") or [])
-                added = current - self.last_channels
-                removed = self.last_channels - current
-
-                for channel in added:
-                    await self.join_channels([channel])
-                    print(f"انضم البوت للقناة: {channel}")
-
-                for channel in removed:
-                    await self.part_channels([channel])
-                    print(f"خرج البوت من القناة: {channel}")
-
-                self.last_channels = current
-
-            except Exception as e:
-                print(f"[خطأ مزامنة القنوات] {e}")
-
-            await asyncio.sleep(30)
+                asyncio.get_running_loop().create_task(self.sync_channels())
+            except RuntimeError:
+                # قبل ما يشتغل البوت، القنوات تتزامن في event_ready
+                pass
+
+    async def sync_channels(self):
+        # القنوات من الإعدادات ومن قائمة القنوات في اللوحة
+        async with self._sync_lock:
+            await self._sync_channels()
+
+    async def _sync_channels(self):
+        try:
+            current = set(self.config.get("channels") or []) | set(self.panel_channels)
+            added = current - self.last_channels
+            removed = self.last_channels - current
+
+            for channel in added:
+                await self.join_channels([channel])
+                print(f"انضم البوت للقناة: {channel}")
+
+            for channel in removed:
+                await self.part_channels([channel])
+                await self.sessions.close(channel)
+                self.channel_config.forget(channel)
+                print(f"خرج البوت من القناة: {channel}")
+
+            self.last_channels = current
+
+        except Exception as e:
+            print(f"[خطأ مزامنة القنوات] {e}")
 
 if __name__ == "__main__":
     bot = WiduxBot()
@@ -1,6 +1,12 @@
 import json
+import os
+import threading
+import time
+from types import MappingProxyType
 
 SETTINGS_FILE_PATH = 'data/bot_settings.json'
+# أقل مدة بين فحصين لتاريخ تعديل الملف
+CHECK_INTERVAL = 1.0
 
 class BotSettings:
     def __init__(self, settings_file=SETTINGS_FILE_PATH):
@@ -11,7 +17,7 @@ class BotSettings:
         try:
             with open(self.settings_file, 'r', encoding='utf-8') as f:
                 return json.load(f)
-        except FileNotFoundError:
+        except (FileNotFoundError, json.JSONDecodeError):
             return {}
 
     def save_settings(self):
@@ -21,6 +27,92 @@ class BotSettings:
     def get(self, key, default=None):
         return self.settings.get(key, default)
 
+    # الاسم المستخدم في main.py و utils/responses.py
+    def get_setting(self, key, default=None):
+        return self.get(key, default)
+
     def set(self, key, value):
         self.settings[key] = value
         self.save_settings()
+
+
+def _stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class SettingsSnapshot:
+    """
+    نسخة ثابتة من الإعدادات ما تتعدل. أي تغيير يطلع نسخة جديدة برقم أعلى،
+    فاللي ماسك نسخة يقرا منها بأمان حتى لو الإعدادات تغيرت بنفس الوقت.
+    """
+
+    __slots__ = ("data", "version", "stamp")
+
+    def __init__(self, data, version=0, stamp=None):
+        self.data = MappingProxyType(dict(data))
+        self.version = version
+        self.stamp = stamp
+
+    def get(self, key, default=None):
+        return self.data.get(key, default)
+
+    def get_setting(self, key, default=None):
+        return self.data.get(key, default)
+
+
+class SettingsCache:
+    """
+    الإعدادات لكل العملية: current() يرجع النسخة الحالية من الذاكرة، وتاريخ تعديل
+    الملف ما ينفحص أكثر من مرة كل CHECK_INTERVAL، فرسائل الشات ما تقرا من القرص.
+    replace() يبدل النسخة مرة وحدة (مثلاً لما توصل تعديلات من سيرفر اللوحة)،
+    و listeners تنادى بـ (القديمة، الجديدة) مع كل تبديل.
+    """
+
+    def __init__(self, settings_file=SETTINGS_FILE_PATH, check_interval=CHECK_INTERVAL):
+        self.settings_file = settings_file
+        self.check_interval = check_interval
+        self.listeners = []
+        self._snapshot = None
+        self._next_check = 0
+        self._lock = threading.Lock()
+
+    def current(self):
+        snapshot = self._snapshot
+        if snapshot is None or time.monotonic() >= self._next_check:
+            snapshot = self._refresh()
+        return snapshot
+
+    def _refresh(self):
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            stamp = _stamp(self.settings_file)
+            if self._snapshot is not None and stamp == self._snapshot.stamp:
+                return self._snapshot
+            data = BotSettings(self.settings_file).settings
+        return self._swap(data, stamp)
+
+    def replace(self, data):
+        stamp = self._snapshot.stamp if self._snapshot is not None else _stamp(self.settings_file)
+        return self._swap(data, stamp)
+
+    def _swap(self, data, stamp):
+        with self._lock:
+            old = self._snapshot
+            new = SettingsSnapshot(data, (old.version + 1) if old else 1, stamp)
+            self._snapshot = new
+        for listener in self.listeners:
+            try:
+                listener(old, new)
+            except Exception as e:
+                print(f"[خطأ تحديث الإعدادات] {e}")
+        return new
+
+
+settings_cache = SettingsCache()
+
+def current_settings():
+    return settings_cache.current()
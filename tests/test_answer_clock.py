@@ -0,0 +1,79 @@
+import pytest
+import time
+from types import SimpleNamespace
+from bot.answer_clock import AnswerClock, DriftStats, server_time
+from bot.questions.normal import NormalQuestion
+
+def message(content="", sent=None, user="p"):
+    tags = {} if sent is None else {"tmi-sent-ts": str(int(sent * 1000))}
+    return SimpleNamespace(content=content, tags=tags, author=SimpleNamespace(name=user))
+
+def test_server_time_parses_the_tag():
+    assert server_time(message(sent=1700000000.5)) == 1700000000.5
+    assert server_time(message()) is None
+    assert server_time(SimpleNamespace(tags={"tmi-sent-ts": "abc"})) is None
+    assert server_time(SimpleNamespace()) is None
+
+def test_missing_tag_falls_back_to_the_local_clock():
+    drift = DriftStats()
+    clock = AnswerClock(drift)
+    assert 0 <= clock.elapsed(message()) < 1
+    assert drift.summary()["fallbacks"] == 1
+    assert drift.count == 0
+
+def test_slow_host_clock_is_corrected_once_per_round(monkeypatch):
+    # ساعة الجهاز متأخرة 30 ثانية عن السيرفر، والرسائل توصلنا بعد 0.1 ثانية
+    now = [0.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    drift = DriftStats()
+    drift.record(970.1 - 1000.0)  # رسالة من سؤال قبل
+    now[0] = 970.0
+    clock = AnswerClock(drift)
+    now[0] = 973.1
+    # التصحيح فيه أقل زمن وصول (0.1) وهو نفسه لكل اللاعبين
+    assert clock.elapsed(message(sent=1003.0)) == pytest.approx(3.1)
+    # عينة أصغر وسط السؤال ما تغير التصحيح
+    now[0] = 975.0
+    assert clock.elapsed(message(sent=1005.5)) == pytest.approx(5.6)
+    assert clock.offset == pytest.approx(-29.9)
+
+def test_processing_lag_never_inflates_answer_times(monkeypatch):
+    # الساعة مضبوطة بس كل رسالة تتعالج بعد 3 ثواني
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    drift = DriftStats()
+    drift.record(3.0)
+    clock = AnswerClock(drift)
+    now[0] = 1006.0
+    assert clock.elapsed(message(sent=1003.0)) == pytest.approx(3.0)
+    now[0] = 1007.5
+    assert clock.elapsed(message(sent=1004.5)) == pytest.approx(4.5)
+    assert drift.summary()["offset_ms"] == 0.0
+
+@pytest.mark.asyncio
+async def test_scoring_tiers_follow_answer_speed(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    messages = [
+        message("الرياض", sent=1002.0, user="fast"),
+        message("الرياض", sent=1007.0, user="slow"),
+        message("جدة", sent=1001.0, user="wrong"),
+        message("الرياض", user="untagged"),
+    ]
+
+    class FakeChannel:
+        async def send(self, msg):
+            pass
+
+    class FakeBot:
+        async def wait_for_responses(self, seconds, check, channel=None, users=None):
+            for msg in messages:
+                sent = server_time(msg)
+                now[0] = (sent if sent is not None else now[0]) + 0.05
+                check(msg)
+
+    drift = DriftStats()
+    question = NormalQuestion("عاصمة السعودية؟", "الرياض")
+    scores = await question.ask(FakeChannel(), FakeBot(), drift=drift)
+    assert scores == {"fast": 10, "slow": 5, "untagged": 10}
+    assert drift.summary()["fallbacks"] == 1
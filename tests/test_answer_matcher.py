@@ -0,0 +1,31 @@
+from bot.answer_matcher import AnswerMatcher, normalize_answer
+
+def test_normalize_unifies_arabic_variants():
+    assert normalize_answer("  إِسْلامـــيّة  ") == "اسلاميه"
+    assert normalize_answer("مستشفى") == "مستشفي"
+    assert normalize_answer("مسؤول") == "مسوول"
+    assert normalize_answer("Paris   France") == "paris france"
+    assert normalize_answer("") == ""
+
+def test_matcher_accepts_correct_and_alternative_answers():
+    matcher = AnswerMatcher("مكة", ["مكة المكرمة", ""])
+    assert matcher.matches("مكّه")
+    assert matcher.matches(" مكة   المكرّمة ")
+    assert not matcher.matches("المدينة")
+    assert len(matcher.answers) == 2
+
+def test_fuzzy_matching_is_bounded_and_opt_in():
+    exact = AnswerMatcher("القاهرة")
+    fuzzy = AnswerMatcher("القاهرة", ["cairo city"], max_typos=1)
+    assert not exact.matches("القاهره٢")
+    assert fuzzy.matches("القاهرا")
+    assert fuzzy.matches("cairo citi")
+    assert not fuzzy.matches("القاهرتين")
+    assert not AnswerMatcher("١٢", max_typos=1).matches("١٣")
+
+def test_from_entry_uses_type_defaults_and_overrides():
+    entry = {"question": "س", "answer": "الرياض", "alternatives": ["riyadh"], "type": "Normal"}
+    assert AnswerMatcher.from_entry(entry).max_typos == 1
+    assert AnswerMatcher.from_entry(entry, "Golden").max_typos == 0
+    assert AnswerMatcher.from_entry({**entry, "max_typos": 2}).max_typos == 2
+    assert AnswerMatcher.from_entry(entry).matches("riyad")
@@ -0,0 +1,29 @@
+from settings_manager import SettingsSnapshot
+from bot.channel_config import ChannelConfigResolver
+
+def make(data, version=1):
+    return SettingsSnapshot(data, version)
+
+def test_layers_and_per_channel_invalidation():
+    state = {"snapshot": make({
+        "mention_limit": 3,
+        "mention_guard_warn_msg": "انتبه",
+        "channel_settings": {"Foo": {"mention_limit": 5, "warning_message": "يا فو", "timeout_message": None}},
+    })}
+    resolver = ChannelConfigResolver(lambda: state["snapshot"])
+    foo, bar = resolver.get("foo"), resolver.get("bar")
+    assert (foo["mention_limit"], foo["mention_guard_warn_msg"]) == (5, "يا فو")
+    assert bar["mention_limit"] == 3 and "channel_settings" not in bar
+    assert resolver.get("FOO") is foo
+
+    # تعديل قناة وحدة يمسح كاشها بس
+    state["snapshot"] = make({**state["snapshot"].data, "channel_settings": {"foo": {"mention_limit": 7}}}, 2)
+    assert resolver.get("bar") is bar
+    assert resolver.get("foo")["mention_limit"] == 7
+
+    resolver.forget("bar")
+    assert resolver.get("bar") is not bar and resolver.get("bar")["mention_limit"] == 3
+
+    # تعديل عام يوصل لكل القنوات
+    state["snapshot"] = make({"mention_limit": 4}, 3)
+    assert resolver.get("foo")["mention_limit"] == 4
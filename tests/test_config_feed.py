@@ -0,0 +1,50 @@
+import asyncio
+import json
+import pytest
+from utils.config_feed import ConfigBroker, ConfigSubscriber, diff_keys
+
+def test_diff_keys_reports_only_changed_keys():
+    assert diff_keys({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 5, "d": 4}) == ({"b": 5, "d": 4}, ["c"])
+
+def test_broker_replays_from_last_event_or_asks_for_snapshot():
+    broker = ConfigBroker(history=2)
+    for i in range(3):
+        broker.publish("settings", {"mention_limit": i})
+    assert broker.publish("settings", {}) is None
+    assert [e["version"] for e in broker.since(broker.event_id(1))] == [2, 3]
+    assert broker.since(broker.event_id(3)) == []
+    # قديم أكثر من السجل، أو من تشغيل ثاني للسيرفر
+    assert broker.since(broker.event_id(0)) is None
+    assert broker.since("other:3") is None
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_live_events_in_order():
+    broker = ConfigBroker()
+    broker.publish("settings", {"bot_username": "widux"})
+
+    async def snapshot():
+        return {"settings": {"bot_username": "widux"}}
+
+    stream = broker.stream(None, snapshot)
+    first = await stream.__anext__()
+    assert '"snapshot": true' in first and first.startswith(f"id: {broker.event_id(1)}")
+    broker.publish("channels", {"channels": ["a"]})
+    live = await asyncio.wait_for(stream.__anext__(), 1)
+    assert json.loads(live.split("data: ")[1])["changes"] == {"channels": ["a"]}
+    await stream.aclose()
+    assert not broker._subscribers
+
+@pytest.mark.asyncio
+async def test_subscriber_skips_duplicate_versions():
+    seen = []
+
+    async def on_event(event):
+        seen.append(event["version"])
+
+    sub = ConfigSubscriber(on_event, url="http://localhost")
+    await sub._handle("b:1", json.dumps({"version": 1, "snapshot": True, "documents": {}}))
+    await sub._handle("b:1", json.dumps({"version": 1, "document": "settings", "changes": {}, "removed": []}))
+    await sub._handle("b:2", json.dumps({"version": 2, "document": "settings", "changes": {}, "removed": []}))
+    # سيرفر جديد يبدأ النسخ من الصفر
+    await sub._handle("c:0", json.dumps({"version": 0, "snapshot": True, "documents": {}}))
+    assert seen == [1, 2, 0]
@@ -0,0 +1,15 @@
+from bot.db import Database
+
+def test_tables_on_one_file_share_a_connection_and_set_up_once(tmp_path):
+    db_path = str(tmp_path / "shared.db")
+    calls = []
+    first = Database(db_path, "CREATE TABLE IF NOT EXISTS a (x INTEGER);", setup=calls.append)
+    second = Database(db_path, "CREATE TABLE IF NOT EXISTS b (y INTEGER);")
+    with first.session() as conn_a:
+        # نفس الخيط يقدر يدخل جلسة ثانية وهو داخل الأولى
+        with second.session() as conn_b:
+            assert conn_a is conn_b
+    with first.session() as conn:
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert tables == {"a", "b"}
+    assert calls == [conn]
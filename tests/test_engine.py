@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from bot.engine import WiduxEngine
 from types import SimpleNamespace
@@ -32,3 +33,61 @@ async def test_set_mode(engine):
     await engine.handle_message(FakeMessage("وج؟"))
     await engine.handle_message(FakeMessage("تيم"))
     assert engine.mode == "تيم"
+
+@pytest.mark.asyncio
+async def test_unexpected_error_while_planning_resets_the_channel():
+    import sqlite3
+
+    class LockedBank:
+        async def type_counts(self):
+            raise sqlite3.OperationalError("database is locked")
+
+        async def draw_many(self, channel, needs):
+            raise sqlite3.OperationalError("database is locked")
+
+    sent = []
+
+    class FakeChannel:
+        name = "chan"
+
+        async def send(self, msg):
+            sent.append(msg)
+
+    engine = WiduxEngine(SimpleNamespace(question_bank=LockedBank()))
+    engine.game_mode = "سولو"
+    engine.main_player = "player1"
+    engine.game_task = asyncio.create_task(engine.play(FakeChannel(), 5))
+    await engine.game_task
+    assert engine.game_mode is None
+    assert not engine.is_active
+    assert sent == ["جاري بدء اللعبة...", "صار خطأ وانلغت اللعبة، جربوا مرة ثانية."]
+
+@pytest.mark.asyncio
+async def test_failed_registration_draws_no_questions(monkeypatch):
+    draws = []
+
+    class Bank:
+        async def type_counts(self):
+            draws.append("counts")
+            return {}
+
+        async def draw_many(self, channel, needs):
+            draws.append(needs)
+            return {}
+
+    class FakeChannel:
+        name = "chan"
+
+        async def send(self, msg):
+            pass
+
+    async def no_wait(seconds):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", no_wait)
+    engine = WiduxEngine(SimpleNamespace(question_bank=Bank()))
+    engine.game_mode = "تحدي"
+    engine.main_player = "player1"
+    await engine.play(FakeChannel(), 5)
+    assert draws == []
+    assert engine.game_mode is None
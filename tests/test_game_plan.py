@@ -0,0 +1,55 @@
+import pytest
+from bot.flow.game_plan import PlanError, compile_plan
+from bot.question_manager import QuestionManager
+from bot.question_store import QuestionStore
+from bot.questions.steal_or_boost import StealOrBoostTeamQuestion
+
+def make_bank(tmp_path, counts):
+    store = QuestionStore(db_path=str(tmp_path / "bank.db"), legacy_path=None)
+    for qtype, n in counts.items():
+        for i in range(n):
+            store.add({"question": f"{qtype} {i}", "answer": "جواب", "type": qtype})
+    return QuestionManager(store)
+
+FULL = {"Normal": 6, "Golden": 1, "Steal": 1, "Sabotage": 1, "Fate": 5, "Doom": 1}
+
+@pytest.mark.asyncio
+async def test_team_plan_is_fully_resolved(tmp_path):
+    plan = await compile_plan(make_bank(tmp_path, FULL), "chan", "تيم", 6)
+    assert [p["type"] for p in plan] == ["normal"] * 6 + ["golden", "steal_or_boost", "sabotage", "fate", "doom"]
+    normals = [p["question"].question for p in plan if p["type"] == "normal"]
+    assert len(set(normals)) == 6
+    assert isinstance(plan[7]["question"], StealOrBoostTeamQuestion)
+    assert len(plan[9]["question"].questions) == 5
+    assert plan[-1]["question"].matcher.matches("جواب")
+
+@pytest.mark.asyncio
+async def test_missing_types_fail_fast(tmp_path):
+    bank = make_bank(tmp_path, dict(FULL, Fate=2, Sabotage=0))
+    # السولو ما يحتاج تخريب، بس المصير ناقص
+    with pytest.raises(PlanError) as info:
+        await compile_plan(bank, "chan", "سولو", 5)
+    assert info.value.missing == {"Fate": (2, 5)}
+    # البنك الناقص ما يحرك أي كيس
+    with bank.sampler.db.session() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM question_bags").fetchone()[0] == 0
+
+@pytest.mark.asyncio
+async def test_plan_entries_carry_stable_bank_ids(tmp_path):
+    bank = make_bank(tmp_path, FULL)
+    plan = await compile_plan(bank, "chan", "سولو", 5)
+    fate = next(p for p in plan if p["type"] == "fate")
+    assert len(fate["ids"]) == 5
+    assert [q["question"] for q in bank.store.fetch_many(fate["ids"])] == [q for q, _, _ in fate["question"].questions]
+    doom = plan[-1]
+    assert bank.store.get(doom["ids"][0])["question"] == doom["question"].question
+
+@pytest.mark.asyncio
+async def test_bank_max_typos_reaches_the_matcher(tmp_path):
+    bank = make_bank(tmp_path, dict(FULL, Golden=0))
+    bank.store.add({"question": "ذهبي", "answer": "القاهرة", "type": "Golden", "max_typos": 1})
+    plan = await compile_plan(bank, "chan", "سولو", 5)
+    golden = next(p for p in plan if p["type"] == "golden")["question"]
+    # الذهبي افتراضيًا مطابقة تامة، بس السؤال نفسه يسمح بخطأ واحد
+    assert golden.matcher.max_typos == 1
+    assert golden.matcher.matches("القاهرو")
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import os
+import pytest
+from utils.json_store import JsonDocument
+
+@pytest.mark.asyncio
+async def test_concurrent_updates_are_not_lost(tmp_path):
+    doc = JsonDocument(str(tmp_path / "channels.json"), [])
+
+    async def add(name):
+        def change(channels):
+            channels.append(name)
+        await doc.update(change)
+
+    await asyncio.gather(*(add(f"c{i}") for i in range(20)))
+    with open(doc.path, encoding="utf-8") as f:
+        assert sorted(json.load(f)) == sorted(f"c{i}" for i in range(20))
+    assert [p for p in os.listdir(tmp_path) if p.startswith(".tmp-")] == []
+
+@pytest.mark.asyncio
+async def test_reads_are_cached_until_file_changes(tmp_path, monkeypatch):
+    import time
+    from utils import json_store
+    now = [100.0]
+    stats = []
+    stamp = json_store._stamp
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(json_store, "_stamp", lambda p: stats.append(p) or stamp(p))
+
+    path = tmp_path / "settings.json"
+    path.write_text("\n", encoding="utf-8")
+    doc = JsonDocument(str(path), {})
+    # ملف فاضي يرجع الافتراضي
+    assert await doc.read() == {}
+    first = await doc.read()
+    assert await doc.read() is first
+    # داخل الثانية ما ينفحص الملف أبد
+    assert len(stats) == 1
+
+    path.write_text('{"mention_limit": 3, "x": "تغيير من برا"}', encoding="utf-8")
+    os.utime(path, ns=(1, 1))
+    assert await doc.read() is first
+    now[0] += 1.0
+    assert (await doc.read())["mention_limit"] == 3
+    assert len(stats) == 2
+
+    def reject(data):
+        data["mention_limit"] = 99
+        raise ValueError("القيمة مرفوضة")
+
+    with pytest.raises(ValueError):
+        await doc.update(reject)
+    assert (await doc.read())["mention_limit"] == 3
+
+@pytest.mark.asyncio
+async def test_collection_ids_survive_edits_and_migrate_legacy_files(tmp_path):
+    from utils.json_store import JsonCollection
+    path = tmp_path / "channels.json"
+    path.write_text('["a", "b"]', encoding="utf-8")
+    channels = JsonCollection(JsonDocument(str(path), []), key="name",
+                              migrate=lambda names: ({"name": n} for n in names))
+    assert await channels.all() == [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+
+    await channels.delete(1)
+    c_id = await channels.add({"name": "c"})
+    # الـ id ما يرجع ينستخدم بعد الحذف، والباقي ما يتغير
+    assert c_id == 3 and await channels.id_of("b") == 2
+    with pytest.raises(ValueError):
+        await channels.add({"name": "b"})
+    await channels.update(2, {"name": "bb"})
+    assert await channels.get(2) == {"id": 2, "name": "bb"}
+    with pytest.raises(KeyError):
+        await channels.delete(1)
@@ -0,0 +1,36 @@
+import pytest
+from bot.leaderboard import Leaderboard, GLOBAL
+
+@pytest.mark.asyncio
+async def test_scores_accumulate_across_games(tmp_path):
+    board = Leaderboard(db_path=str(tmp_path / "board.db"), top_k=2)
+    await board.record_game("ChanA", {"a": 30, "b": 10})
+    assert await board.top("chana") == [("a", 30), ("b", 10)]
+
+    await board.record_game("chanb", {"b": 50, "c": 5})
+    assert await board.top(GLOBAL) == [("b", 60), ("a", 30)]
+    assert await board.top("chana") == [("a", 30), ("b", 10)]
+
+    rank = await board.rank("*", "a")
+    assert rank == {"player": "a", "points": 30, "games": 1, "rank": 2}
+    assert await board.rank("chana", "nobody") is None
+
+@pytest.mark.asyncio
+async def test_cached_top_survives_a_drop_in_points(tmp_path):
+    board = Leaderboard(db_path=str(tmp_path / "board.db"), top_k=2)
+    await board.record_game("chan", {"a": 30, "b": 20, "c": 10})
+    assert await board.top("chan") == [("a", 30), ("b", 20)]
+    await board.record_game("chan", {"b": -15})
+    assert await board.top("chan") == [("a", 30), ("c", 10)]
+
+@pytest.mark.asyncio
+async def test_rank_counts_players_per_score_and_ties(tmp_path):
+    board = Leaderboard(db_path=str(tmp_path / "board.db"))
+    await board.record_game("chan", {"a": 50, "b": 50, "c": 20, "d": 10})
+    await board.record_game("chan", {"d": 40})
+    assert (await board.rank("chan", "c"))["rank"] == 4
+    assert (await board.rank("chan", "d"))["rank"] == 1
+    assert (await board.rank("chan", "b"))["rank"] == 1
+    with board.db.session() as conn:
+        scores = conn.execute("SELECT points, players FROM leaderboard_scores WHERE channel = 'chan' ORDER BY points").fetchall()
+    assert scores == [(20, 1), (50, 3)]
@@ -1,5 +1,6 @@
 import pytest
 from bot.mention_guard import MentionGuard
+from bot.mention_store import MentionStore
 import time
 
 @pytest.fixture
@@ -26,3 +27,95 @@ def test_cooldown_after_timeout(guard):
     guard.no_timeout_users["cooluser"] = time.time()
     result = guard.handle_mention("cooluser")
     assert result["action"] == "roast"
+
+def test_channel_config_overrides_limits(guard):
+    guard.set_config(limit=3, duration=5, cooldown=86400, warning_thresh=2, warn_msg="تحذير!", timeout_msg="تايم أوت!")
+    config = {"mention_limit": 1, "mention_guard_duration": 60, "mention_guard_timeout_msg": "برا"}
+    result = guard.handle_mention("channeluser", config)
+    assert (result["action"], result["duration"], result["message"]) == ("timeout", 60, "برا")
+
+def test_old_mentions_slide_out_of_the_window(guard, monkeypatch):
+    guard.set_config(limit=3, duration=5, cooldown=60, warning_thresh=2, warn_msg="تحذير!", timeout_msg="تايم أوت!", window=100)
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    assert guard.handle_mention("slow", channel="a")["action"] == "roast"
+    now[0] += 150
+    # المنشن الأول طلع من النافذة، فهذا أول واحد من جديد
+    assert guard.handle_mention("slow", channel="a")["action"] == "roast"
+    assert guard.handle_mention("slow", channel="a")["action"] == "warn"
+    # كل قناة لها عد مستقل
+    assert guard.handle_mention("slow", channel="b")["action"] == "roast"
+
+def test_idle_users_and_expired_cooldowns_are_evicted(guard, monkeypatch):
+    guard.set_config(limit=2, duration=5, cooldown=50, warning_thresh=5, warn_msg="w", timeout_msg="t", window=100)
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    for i in range(50):
+        guard.handle_mention(f"user{i}", channel="c")
+    guard.handle_mention("spammer", channel="c")
+    assert guard.handle_mention("spammer", channel="c")["action"] == "timeout"
+    assert guard.stats() == {"tracked_users": 50, "cooldown_users": 1, "evicted": 0, "pending_writes": 0, "flushed": 0}
+    now[0] += 200
+    guard.handle_mention("late", channel="c")
+    assert guard.stats() == {"tracked_users": 1, "cooldown_users": 0, "evicted": 51, "pending_writes": 0, "flushed": 0}
+
+@pytest.mark.asyncio
+async def test_timeout_survives_a_restart(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "guard.db")
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+
+    first = MentionGuard(store=MentionStore(db_path))
+    first.general_roasts = ["طقطقة"]
+    first.set_config(limit=2, duration=5, cooldown=300, warning_thresh=5, warn_msg="w", timeout_msg="t", window=100)
+    first.handle_mention("spammer", channel="Chan")
+    assert first.handle_mention("spammer", channel="Chan")["action"] == "timeout"
+    first.handle_mention("quiet", channel="chan")
+    assert first.stats()["pending_writes"] == 2
+    assert await first.flush() == 2
+    assert await first.flush() == 0
+
+    # عملية جديدة (إعادة تشغيل أو شارد ثاني) ترجع الحالة أول ما يمنشن
+    now[0] += 10
+    second = MentionGuard(store=MentionStore(db_path))
+    second.general_roasts = ["طقطقة"]
+    second.set_config(limit=2, duration=5, cooldown=300, warning_thresh=5, warn_msg="w", timeout_msg="t", window=100)
+    await second.restore("spammer", "chan")
+    assert second.handle_mention("spammer", channel="chan")["action"] == "roast"
+    await second.restore("quiet", "chan")
+    assert second.handle_mention("quiet", channel="chan")["action"] == "timeout"
+
+@pytest.mark.asyncio
+async def test_older_write_does_not_undo_a_newer_timeout(tmp_path):
+    store = MentionStore(str(tmp_path / "guard.db"))
+    store.save_many([("chan", "u", [], 500.0, 500.0)])
+    store.save_many([("chan", "u", [400.0], None, 450.0)])
+    assert store.load("chan", "u") == ([], 500.0)
+    # اللي خلصت نافذته والتايم أوت حقه ينمسح مع الدفعة
+    store.save_many([("chan", "other", [900.0], None, 900.0)], idle_before=800.0, expired_before=600.0)
+    assert store.load("chan", "u") is None
+    assert store.load("chan", "other") == ([900.0], None)
+
+@pytest.mark.asyncio
+async def test_restored_users_keep_the_eviction_order(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    store = MentionStore(str(tmp_path / "guard.db"))
+    store.save_many([("chan", "old", [950.0], 960.0, 960.0), ("chan", "mid", [995.0], None, 995.0)])
+
+    guard = MentionGuard(store=store)
+    guard.general_roasts = ["طقطقة"]
+    guard.set_config(limit=5, duration=5, cooldown=100, warning_thresh=4, warn_msg="w", timeout_msg="t", window=100)
+    guard.handle_mention("fresh", channel="chan")
+    await guard.restore("mid", "chan")
+    await guard.restore("old", "chan")
+    assert list(guard.mention_counts) == [("chan", "old"), ("chan", "mid"), ("chan", "fresh")]
+
+    # old يطلع من النافذة قبل الباقين حتى لو انسترجع بعدهم
+    now[0] = 1052.0
+    guard.handle_mention("fresh", channel="chan")
+    assert list(guard.mention_counts) == [("chan", "mid"), ("chan", "fresh")]
+    assert guard.stats()["cooldown_users"] == 1
+    now[0] = 1061.0
+    guard.handle_mention("fresh", channel="chan")
+    assert guard.stats()["cooldown_users"] == 0
@@ -0,0 +1,60 @@
+import asyncio
+import pytest
+from bot.flow.phase_runner import PhaseRunner, FINISHED, CANCELLED
+
+@pytest.mark.asyncio
+async def test_runs_every_phase_in_order():
+    seen = []
+
+    async def run_phase(phase):
+        seen.append(phase["type"])
+
+    runner = PhaseRunner([{"type": "normal"}] * 3 + [{"type": "doom"}], run_phase, gap=0)
+    assert await runner.run() == FINISHED
+    assert seen == ["normal", "normal", "normal", "doom"]
+    assert runner.snapshot()["phase"] is None
+
+@pytest.mark.asyncio
+async def test_errors_are_reported_and_cancel_stops_the_plan():
+    errors = []
+
+    async def run_phase(phase):
+        if phase["type"] == "golden":
+            raise ValueError("boom")
+        await asyncio.sleep(10)
+
+    async def on_error(phase, e):
+        errors.append(str(e))
+
+    runner = PhaseRunner([{"type": "golden"}, {"type": "normal"}, {"type": "doom"}], run_phase, on_error=on_error, gap=0)
+    task = asyncio.create_task(runner.run())
+    await asyncio.sleep(0.01)
+    assert runner.snapshot()["phase"] == "normal"
+    assert runner.remaining > 0
+    runner.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert errors == ["boom"]
+    assert runner.state == CANCELLED
+
+@pytest.mark.asyncio
+async def test_timed_out_phase_is_reported_separately(monkeypatch):
+    from bot.flow import phase_runner
+    monkeypatch.setitem(phase_runner.PHASE_TIMEOUTS, "normal", 0.01)
+    timeouts, errors = [], []
+
+    async def run_phase(phase):
+        if phase["type"] == "normal":
+            await asyncio.sleep(10)
+
+    async def on_error(phase, e):
+        errors.append(e)
+
+    async def on_timeout(phase):
+        timeouts.append(phase["type"])
+
+    runner = PhaseRunner([{"type": "normal"}, {"type": "doom"}], run_phase,
+                         on_error=on_error, on_timeout=on_timeout, gap=0)
+    assert await runner.run() == FINISHED
+    assert timeouts == ["normal"]
+    assert errors == []
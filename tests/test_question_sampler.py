@@ -0,0 +1,84 @@
+import pytest
+from bot.question_manager import QuestionManager
+from bot.question_sampler import QuestionSampler
+from bot.question_store import QuestionStore
+
+def make_bank(tmp_path, n=7):
+    db = str(tmp_path / "bank.db")
+    store = QuestionStore(db_path=db, legacy_path=None)
+    for i in range(n):
+        store.add({"question": f"q{i}", "answer": "a", "type": "Normal"})
+    return store, db
+
+def test_channel_sees_whole_bank_before_repeat(tmp_path):
+    store, db = make_bank(tmp_path)
+    sampler = QuestionSampler(store, db)
+    first = sampler.draw_ids("Chan", "Normal", 4) + sampler.draw_ids("chan", "normal", 3)
+    assert sorted(first) == store.ids("Normal")
+    # الكيس الثاني يبدأ بعد ما خلص الأول، وما فيه تكرار داخل السحبة الوحدة
+    again = sampler.draw_ids("chan", "Normal", 7)
+    assert sorted(again) == sorted(first)
+
+def test_bag_state_survives_restart_and_is_per_channel(tmp_path):
+    store, db = make_bank(tmp_path)
+    drawn = QuestionSampler(store, db).draw_ids("chan", "Normal", 5)
+    restarted = QuestionSampler(store, db)
+    rest = restarted.draw_ids("chan", "Normal", 2)
+    assert sorted(drawn + rest) == store.ids("Normal")
+    assert len(restarted.draw_ids("other", "Normal", 7)) == 7
+    assert restarted.draw_ids("chan", "Fate", 3) == []
+
+def test_draw_skips_deleted_questions(tmp_path):
+    store, db = make_bank(tmp_path)
+    sampler = QuestionSampler(store, db)
+    sampler.draw_ids("chan", "Normal", 1)
+    store.delete(store.ids("Normal")[0])
+    questions = sampler.draw("chan", "Normal", 6)
+    assert len(questions) == 6
+    assert len({q["id"] for q in questions}) == 6
+
+@pytest.mark.asyncio
+async def test_bank_changes_reach_bags_without_polling(tmp_path):
+    store, db = make_bank(tmp_path, 3)
+    bank = QuestionManager(store)
+    first = await bank.get_questions_by_type("Normal", 1, channel="chan")
+
+    store.add({"question": "جديد", "answer": "a", "type": "Normal"})
+    store.delete(first[0]["id"] + 1 if first[0]["id"] < 3 else 1)
+
+    # بدون أي تحديث من البوت: الكيس ياخذ التعديلات أول ما ينسحب منه
+    rest = await bank.get_questions_by_type("Normal", 2, channel="chan")
+    # السؤال الجديد دخل الكيس الحالي، والمحذوف طلع منه قبل ما يخلص
+    assert {q["id"] for q in rest} | {first[0]["id"]} == set(store.ids("Normal"))
+
+def test_changes_reach_only_the_bag_being_drawn(tmp_path):
+    store, db = make_bank(tmp_path, 6)
+    sampler = QuestionSampler(store, db)
+    sampler.draw_ids("a", "Normal", 2)
+    sampler.draw_ids("b", "Normal", 2)
+
+    def bag(channel):
+        from array import array
+        with sampler.db.session() as conn:
+            blob, cursor, version = conn.execute(
+                "SELECT ids, cursor, version FROM question_bags WHERE channel = ?", (channel,)
+            ).fetchone()
+        ids = array("I")
+        ids.frombytes(blob)
+        return ids.tolist(), cursor, version
+
+    before, cursor, _ = bag("a")
+    new_id = store.add({"question": "جديد", "answer": "a", "type": "Normal"})
+    gone = before[-1]
+    store.delete(gone)
+    sampler.draw_ids("a", "Normal", 1)
+
+    after, _, version = bag("a")
+    assert version == store.version()
+    # اللي انسحب ما تغير، والباقي نفس ترتيبه بس الجديد داخل والمحذوف طالع
+    assert after[:cursor] == before[:cursor]
+    assert [qid for qid in after[cursor:] if qid != new_id] == [qid for qid in before[cursor:] if qid != gone]
+    assert new_id in after[cursor:]
+    # كيس القناة الثانية ما انلمس
+    assert bag("b")[2] < store.version()
+    assert gone not in sampler.draw_ids("b", "Normal", 5)
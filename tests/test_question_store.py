@@ -0,0 +1,113 @@
+from bot.question_store import QuestionStore
+
+def make_store(tmp_path):
+    return QuestionStore(db_path=str(tmp_path / "bank.db"), legacy_path=None)
+
+def test_add_validates_and_normalizes_type(tmp_path):
+    store = make_store(tmp_path)
+    qid = store.add({"question": "عاصمة قطر؟", "answer": "الدوحة", "alternatives": "doha, ", "type": "عادي"})
+    assert store.get(qid) == {
+        "id": qid, "question": "عاصمة قطر؟", "answer": "الدوحة",
+        "alternatives": ["doha"], "category": None, "type": "Normal", "max_typos": None,
+    }
+    try:
+        store.add({"question": "س", "answer": "ج", "type": "غلط"})
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+
+def test_sample_is_distinct_and_stays_within_type(tmp_path):
+    store = make_store(tmp_path)
+    for i in range(30):
+        store.add({"question": f"q{i}", "answer": "a", "type": "Golden" if i % 3 else "Doom"})
+    ids = store.sample_ids("golden", 15)
+    assert len(ids) == len(set(ids)) == 15
+    assert {q["type"] for q in store.fetch_many(ids)} == {"Golden"}
+    assert len(store.sample("Doom", 50)) == 10
+    assert store.counts()["Golden"] == 20
+    assert store.sample("Fate", 3) == []
+
+def test_bulk_import_reports_row_errors_and_round_trips(tmp_path):
+    import io
+    from bot.question_io import export_csv, export_jsonl, import_questions
+    store = make_store(tmp_path)
+    lines = [
+        '{"question": "س1", "answer": "ج1", "type": "Normal", "alternatives": ["a"]}',
+        "not json",
+        '{"question": "س2", "answer": "ج2", "type": "غلط"}',
+        '{"question": "س3", "answer": "ج3", "type": "ذهبي"}',
+    ]
+    report = import_questions(store, io.BytesIO("\n".join(lines).encode()), "jsonl", batch_size=1)
+    assert (report["rows"], report["inserted"], report["failed"]) == (4, 2, 2)
+    assert [e["line"] for e in report["errors"]] == [2, 3]
+
+    csv_text = "".join(export_csv(store.iter_all(batch=1)))
+    (tmp_path / "copy").mkdir()
+    again = make_store(tmp_path / "copy")
+    report = import_questions(again, io.BytesIO(csv_text.encode()), "csv")
+    assert report["inserted"] == 2 and report["failed"] == 0
+    strip = lambda qs: [{k: v for k, v in q.items() if k != "id"} for q in qs]
+    assert strip(again.all()) == strip(store.all())
+    assert len(list(export_jsonl(store.iter_all("Golden")))) == 1
+
+def test_broken_csv_row_does_not_stop_the_import(tmp_path):
+    import csv, io
+    from bot.question_io import import_questions
+    store = make_store(tmp_path)
+    huge = "x" * (csv.field_size_limit() + 1)
+    text = f"question,answer,type\nس1,ج1,Normal\n{huge},ج2,Normal\nس3,ج3,Doom\n"
+    report = import_questions(store, io.BytesIO(text.encode()), "csv")
+    assert (report["rows"], report["inserted"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["line"] == 3
+    assert {q["question"] for q in store.all()} == {"س1", "س3"}
+
+def test_counts_follow_writes_from_any_connection(tmp_path):
+    import sqlite3
+    store = make_store(tmp_path)
+    ids = [store.add({"question": f"q{i}", "answer": "a", "type": "Doom"}) for i in range(3)]
+    store.delete(ids[0])
+    # تعديل من برا البوت (مثل اللوحة) لازم ينحسب بعد
+    conn = sqlite3.connect(store.db_path)
+    with conn:
+        conn.execute("UPDATE questions SET type = 'Fate' WHERE id = ?", (ids[1],))
+    version, counts = store.state()
+    assert (counts["Doom"], counts["Fate"]) == (1, 1)
+    assert version == store.version() == 6
+
+def test_page_walks_filtered_questions_by_cursor(tmp_path):
+    store = make_store(tmp_path)
+    for i in range(7):
+        store.add({"question": f"q{i}", "answer": "a", "type": "Steal", "category": "عام" if i % 2 else "رياضة"})
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.page(2, cursor, qtype="سرقة", category="عام")
+        seen += [q["question"] for q in page]
+        if cursor is None:
+            break
+    assert seen == ["q1", "q3", "q5"]
+    assert store.page(10, qtype="Doom") == ([], None)
+
+def test_max_typos_is_validated_stored_and_migrated(tmp_path):
+    import sqlite3
+    import pytest
+    db_path = str(tmp_path / "old.db")
+    # قاعدة قديمة قبل عمود max_typos
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE questions (id INTEGER PRIMARY KEY AUTOINCREMENT, question TEXT NOT NULL, "
+        "correct_answer TEXT NOT NULL, alt_answers TEXT, category TEXT, type TEXT)"
+    )
+    conn.execute("INSERT INTO questions (question, correct_answer, type) VALUES ('قديم', 'ج', 'Normal')")
+    conn.commit()
+    conn.close()
+
+    store = QuestionStore(db_path=db_path, legacy_path=None)
+    assert store.get(1)["max_typos"] is None
+    qid = store.add({"question": "س", "answer": "ج", "type": "Golden", "max_typos": "2"})
+    assert store.get(qid)["max_typos"] == 2
+    store.update(qid, {"question": "س", "answer": "ج", "type": "Golden", "max_typos": 0})
+    assert store.get(qid)["max_typos"] == 0
+    for bad in (9, -1, "كثير", True):
+        with pytest.raises(ValueError):
+            store.add({"question": "س", "answer": "ج", "type": "Normal", "max_typos": bad})
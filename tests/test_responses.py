@@ -0,0 +1,26 @@
+from settings_manager import SettingsSnapshot
+from utils.responses import ResponseCatalog, Template, compile_responses
+
+def test_template_renders_slots_and_keeps_unknown_ones():
+    template = Template("{player} فاز على {team} {x}")
+    assert template.slots == {"player", "team", "x"}
+    assert template.render({"player": "ali", "team": 3}) == "ali فاز على 3 {x}"
+    assert Template("بدون متغيرات").render({"player": "a"}) == "بدون متغيرات"
+
+def test_templates_with_unexpected_placeholders_are_dropped():
+    templates = compile_responses("team_win_responses", ["فاز {team}", "فاز {player}", ""])
+    assert [t.render({"team": "أزرق"}) for t in templates] == ["فاز أزرق"]
+    # مفتاح ما نعرف متغيراته ما ينفلتر
+    assert len(compile_responses("custom_key", "{anything}")) == 1
+
+def test_catalog_recompiles_only_changed_keys():
+    state = {"snapshot": SettingsSnapshot({"custom_responses": {"a": ["x"], "b": "y"}}, 1)}
+    catalog = ResponseCatalog(lambda: state["snapshot"])
+    a, b = catalog.templates("a"), catalog.templates("b")
+    assert catalog.templates("a") is a
+
+    state["snapshot"] = SettingsSnapshot({"custom_responses": {"a": ["x"], "b": "z"}}, 2)
+    assert catalog.templates("a") is a
+    assert catalog.templates("b") is not b
+    assert catalog.templates("b")[0].render() == "z"
+    assert catalog.templates("missing") == ()
@@ -0,0 +1,25 @@
+from bot.roster import Roster, BLUE, RED
+
+def test_players_register_once_and_keep_order():
+    roster = Roster()
+    assert roster.add("a", BLUE)
+    assert roster.add("b", RED)
+    assert roster.add("c", BLUE)
+    assert not roster.add("a", RED)
+    assert roster.team_of("a") == BLUE
+    assert list(roster[BLUE]) == ["a", "c"]
+    assert roster.teams() == {BLUE: ["a", "c"], RED: ["b"]}
+    assert roster.players == ["a", "b", "c"]
+
+def test_leaders_and_kicked_players():
+    roster = Roster()
+    for user, team in (("a", BLUE), ("b", BLUE), ("c", RED)):
+        roster.add(user, team)
+    roster.set_leader(BLUE, "a")
+    roster.kick("b")
+    assert roster.is_leader("a") and not roster.is_leader("c")
+    assert roster.active(BLUE) == ["a"]
+    assert roster.active() == ["a", "c"]
+    assert "b" in roster and not roster.is_active("b")
+    roster.clear()
+    assert len(roster) == 0 and roster.leader_of(BLUE) is None
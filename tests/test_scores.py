@@ -0,0 +1,32 @@
+from bot.roster import Roster, BLUE, RED
+from bot.scores import ScoreLedger
+
+def make_ledger():
+    roster = Roster()
+    for user, team in (("a", BLUE), ("b", BLUE), ("c", RED)):
+        roster.add(user, team)
+    return ScoreLedger(roster)
+
+def test_team_totals_and_ranking_follow_every_change():
+    points = make_ledger()
+    points.phase = "normal"
+    points.add("a", 10, "normal")
+    points.add("b", 5, "normal")
+    points.add("c", 20, "normal")
+    points.multiply("a", 2, "doom")
+    points.set("c", 0, "stolen")
+    assert points.team_total(BLUE) == 25
+    assert points.team_total(RED) == 0
+    assert points.top(2) == [("a", 20), ("b", 5)]
+    assert [e.delta for e in points.history("a")] == [10, 10]
+    assert points.events[0].phase == "normal"
+
+def test_kicked_players_drop_out_of_totals():
+    points = make_ledger()
+    points.add("b", 30, "golden")
+    points.kick("b", "sabotage")
+    points.add("b", 10, "fate")
+    assert points["b"] == 0
+    assert points.team_total(BLUE) == 0
+    assert points.top() == []
+    assert points.events[-1].reason == "sabotage"
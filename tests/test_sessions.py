@@ -0,0 +1,25 @@
+import pytest
+from types import SimpleNamespace
+from bot.sessions import SessionRegistry
+
+@pytest.fixture
+def registry():
+    return SessionRegistry(SimpleNamespace(), idle_ttl=60)
+
+def test_sessions_are_isolated_per_channel(registry):
+    a = registry.get("ChannelA")
+    b = registry.get("channelb")
+    assert a is not b
+    assert registry.get("channela") is a
+    a.roster.add("player1")
+    assert b.players == []
+    assert a.channel_name == "channela"
+
+def test_idle_sessions_are_evicted(registry):
+    registry.get("idle")
+    busy = registry.get("busy")
+    busy.game_mode = "سولو"
+    evicted = registry.evict_idle(now=10 ** 9)
+    assert evicted == ["idle"]
+    assert "busy" in registry
+    assert "idle" not in registry
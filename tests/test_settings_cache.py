@@ -0,0 +1,40 @@
+import json
+import os
+import pytest
+from settings_manager import SettingsCache
+
+def write(path, data, ns):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(ns, ns))
+
+def test_snapshot_is_shared_until_file_changes(tmp_path):
+    path = tmp_path / "bot_settings.json"
+    write(path, {"bot_username": "widux"}, 1)
+    cache = SettingsCache(str(path), check_interval=0)
+    first = cache.current()
+    assert cache.current() is first
+    with pytest.raises(TypeError):
+        first.data["bot_username"] = "x"
+
+    write(path, {"bot_username": "widux2"}, 2)
+    second = cache.current()
+    assert second.get("bot_username") == "widux2" and second.version == first.version + 1
+    # اللي ماسك النسخة القديمة ما يتأثر
+    assert first.get("bot_username") == "widux"
+
+def test_file_is_checked_at_most_once_per_interval(tmp_path):
+    path = tmp_path / "bot_settings.json"
+    write(path, {"a": 1}, 1)
+    cache = SettingsCache(str(path), check_interval=3600)
+    first = cache.current()
+    write(path, {"a": 2}, 2)
+    assert cache.current() is first
+
+def test_replace_swaps_and_notifies_listeners(tmp_path):
+    cache = SettingsCache(str(tmp_path / "missing.json"))
+    seen = []
+    cache.listeners.append(lambda old, new: seen.append((old and dict(old.data), dict(new.data))))
+    assert cache.current().get("a") is None
+    cache.replace({"a": 1})
+    assert cache.current().get_setting("a") == 1
+    assert seen == [(None, {}), ({}, {"a": 1})]
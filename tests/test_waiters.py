@@ -0,0 +1,39 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from bot.waiters import WaiterRegistry
+
+def make_message(channel, user, content):
+    return SimpleNamespace(
+        channel=SimpleNamespace(name=channel),
+        author=SimpleNamespace(name=user),
+        content=content,
+    )
+
+@pytest.mark.asyncio
+async def test_messages_only_reach_matching_waiters():
+    registry = WaiterRegistry()
+    seen = []
+
+    def leaders_only(msg):
+        seen.append(msg.author.name)
+        return msg.content == "1"
+
+    task = asyncio.create_task(registry.wait(1, leaders_only, channel="chan", users=["leader"]))
+    await asyncio.sleep(0)
+    registry.dispatch(make_message("chan", "viewer", "1"))
+    registry.dispatch(make_message("other", "leader", "1"))
+    registry.dispatch(make_message("chan", "leader", "1"))
+    result = await task
+
+    assert result.author.name == "leader"
+    assert seen == ["leader"]
+    assert registry.active() == []
+    assert registry.recent[-1]["messages"] == 1
+
+@pytest.mark.asyncio
+async def test_wait_returns_none_or_raises_on_timeout():
+    registry = WaiterRegistry()
+    assert await registry.wait(0.01, lambda msg: False, channel="chan") is None
+    with pytest.raises(asyncio.TimeoutError):
+        await registry.wait(0.01, lambda msg: False, channel="chan", raise_on_timeout=True)
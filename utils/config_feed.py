@@ -0,0 +1,176 @@
+import asyncio
+import json
+import os
+import uuid
+from collections import deque
+
+import aiohttp
+
+API_URL = os.environ.get("WIDUX_API_URL", "http://127.0.0.1:9001")
+EVENTS_PATH = "/api/events"
+# كل كم ثانية يرسل السيرفر ping عشان الاتصال ما ينقطع من البروكسي
+KEEPALIVE = 15
+
+
+def diff_keys(old, new):
+    """
+    يرجع (المفاتيح اللي تغيرت أو انضافت مع قيمها الجديدة، المفاتيح اللي انحذفت).
+    """
+    old = old or {}
+    new = new or {}
+    changes = {key: value for key, value in new.items() if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    return changes, removed
+
+
+def format_event(event_id, event):
+    data = json.dumps(event, ensure_ascii=False)
+    return f"id: {event_id}\ndata: {data}\n\n"
+
+
+class ConfigBroker:
+    """
+    ينشر تعديلات الإعدادات من سيرفر اللوحة للبوت كأحداث SSE. كل حدث له رقم نسخة يزيد،
+    وآخر الأحداث محفوظة عشان البوت إذا انقطع يكمل من آخر نسخة وصلته (Last-Event-ID).
+    إذا النسخة قديمة أو السيرفر انعاد تشغيله، يرسل snapshot كامل بدال الفروقات.
+    """
+
+    def __init__(self, history=256, queue_size=256):
+        # رقم تشغيل السيرفر: النسخ تبدأ من الصفر مع كل تشغيل
+        self.boot = uuid.uuid4().hex[:8]
+        self.version = 0
+        self.queue_size = queue_size
+        self._history = deque(maxlen=history)
+        self._subscribers = set()
+
+    def event_id(self, version):
+        return f"{self.boot}:{version}"
+
+    def publish(self, document, changes, removed=()):
+        if not changes and not removed:
+            return None
+        self.version += 1
+        event = {
+            "version": self.version,
+            "document": document,
+            "changes": changes,
+            "removed": list(removed),
+        }
+        self._history.append(event)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # مشترك بطيء: نقطعه، ويرجع يتصل وياخذ snapshot
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        return event
+
+    def since(self, last_event_id):
+        # الأحداث بعد النسخة المطلوبة، أو None إذا لازم snapshot
+        boot, _, version = (last_event_id or "").partition(":")
+        if boot != self.boot or not version.isdigit():
+            return None
+        version = int(version)
+        if version == self.version:
+            return []
+        if not self._history or self._history[0]["version"] > version + 1:
+            return None
+        return [event for event in self._history if event["version"] > version]
+
+    async def stream(self, last_event_id, snapshot):
+        """
+        يولد نص SSE للمشترك: أول شي الفروقات اللي فاتته أو snapshot كامل من
+        snapshot()، وبعدها كل حدث جديد أول ما ينشر.
+        """
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            replay = self.since(last_event_id)
+            if replay is None:
+                version = self.version
+                documents = await snapshot()
+                yield format_event(self.event_id(version), {"version": version, "snapshot": True, "documents": documents})
+            else:
+                for event in replay:
+                    yield format_event(self.event_id(event["version"]), event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if event is None:
+                    return
+                yield format_event(self.event_id(event["version"]), event)
+        finally:
+            self._subscribers.discard(queue)
+
+
+class ConfigSubscriber:
+    """
+    طرف البوت: يشترك في أحداث الإعدادات من سيرفر اللوحة ويمرر كل حدث على on_event
+    بالترتيب وبدون تكرار. إذا الاتصال انقطع يرجع يتصل ويكمل من آخر نسخة.
+    """
+
+    def __init__(self, on_event, url=API_URL, max_backoff=30):
+        self.on_event = on_event
+        self.url = url.rstrip("/") + EVENTS_PATH
+        self.max_backoff = max_backoff
+        self.last_event_id = None
+        self.version = None
+        self.connected = False
+
+    async def _handle(self, event_id, data):
+        event = json.loads(data)
+        boot = (event_id or "").partition(":")[0]
+        last_boot = (self.last_event_id or "").partition(":")[0]
+        # نفس الحدث ممكن يوصل مرتين (إعادة الإرسال + الطابور)، نطبق الجديد بس
+        if not event.get("snapshot") and boot == last_boot and self.version is not None \
+                and event["version"] <= self.version:
+            return
+        self.last_event_id = event_id
+        self.version = event["version"]
+        await self.on_event(event)
+
+    async def _listen(self, session):
+        headers = {"Accept": "text/event-stream"}
+        if self.last_event_id:
+            headers["Last-Event-ID"] = self.last_event_id
+        async with session.get(self.url, headers=headers, timeout=aiohttp.ClientTimeout(total=None)) as response:
+            response.raise_for_status()
+            self.connected = True
+            # نقسم الأسطر بنفسنا لأن سطر الـ snapshot ممكن يكون أكبر من حد readline
+            buffer = b""
+            event_id, data = None, []
+            async for chunk in response.content.iter_any():
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for raw in lines:
+                    line = raw.decode("utf-8").rstrip("\r")
+                    if not line:
+                        if data:
+                            await self._handle(event_id, "\n".join(data))
+                        event_id, data = None, []
+                    elif line.startswith("id:"):
+                        event_id = line[3:].strip()
+                    elif line.startswith("data:"):
+                        data.append(line[5:].strip())
+
+    async def run(self):
+        backoff = 1
+        async with aiohttp.ClientSession() as session:
+            while True:
+                try:
+                    await self._listen(session)
+                    backoff = 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"[خطأ اشتراك الإعدادات] {e}")
+                finally:
+                    self.connected = False
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
@@ -0,0 +1,245 @@
+import asyncio
+import copy
+import json
+import os
+import tempfile
+import time
+
+# أقل مدة بين فحصين لتاريخ تعديل الملف
+CHECK_INTERVAL = 1.0
+
+
+def _stamp(path):
+    # بصمة الملف: إذا تغيرت، أحد عدل الملف من برا (اللوحة القديمة أو يدويًا)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def read_json(path, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return copy.deepcopy(default)
+    except ValueError:
+        # ملف فاضي أو خربان: نرجع الافتراضي بدل ما يطيح الطلب
+        print(f"[ملف JSON غير صالح] {path}")
+        return copy.deepcopy(default)
+
+
+def write_json_atomic(path, data):
+    # نكتب في ملف مؤقت بنفس المجلد وبعدين rename، فما أحد يقرا ملف نص مكتوب
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class JsonDocument:
+    """
+    ملف JSON واحد مع نسخة في الذاكرة. القراءة ترجع النسخة المحفوظة ما دام الملف
+    ما تغير (mtime/الحجم)، وتاريخ التعديل ما ينفحص أكثر من مرة كل CHECK_INTERVAL،
+    فطلبات اللوحة المتتالية ما تلمس القرص.
+    التعديل يصير تحت قفل خاص بالملف ويتكتب بشكل ذري، والقراءة والكتابة الفعلية
+    في thread منفصل عشان ما توقف الـ event loop.
+    """
+
+    def __init__(self, path, default=None, check_interval=CHECK_INTERVAL):
+        self.path = path
+        self.default = default
+        self.check_interval = check_interval
+        self.version = 0
+        self._data = None
+        self._stamp = None
+        self._next_check = 0
+        self._lock = asyncio.Lock()
+        # دوال (القديم، الجديد) تنادى بعد كل تغيير، مثل نشر التعديل للبوت
+        self.listeners = []
+
+    def _notify(self, old, new):
+        for listener in self.listeners:
+            try:
+                listener(old, new)
+            except Exception as e:
+                print(f"[خطأ مستمع {self.path}] {e}")
+
+    async def _reload(self):
+        self._next_check = time.monotonic() + self.check_interval
+        stamp = await asyncio.to_thread(_stamp, self.path)
+        if self._data is not None and stamp == self._stamp:
+            return
+        old = self._data
+        self._data = await asyncio.to_thread(read_json, self.path, self.default)
+        self._stamp = stamp
+        self.version += 1
+        if old is not None:
+            # الملف تعدل من برا
+            self._notify(old, self._data)
+
+    async def read(self):
+        """
+        يرجع المحتوى المحفوظ، وهو مشترك بين الطلبات فلا يتعدل مباشرة (استخدم update).
+        """
+        if self._data is None or time.monotonic() >= self._next_check:
+            async with self._lock:
+                await self._reload()
+        return self._data
+
+    async def write(self, data):
+        async with self._lock:
+            await self._write(data)
+
+    async def update(self, change):
+        """
+        يقرا آخر نسخة، ويمرر نسخة منها على change، ويحفظ النتيجة تحت نفس القفل،
+        فطلبين في نفس الوقت ما يضيع تعديل واحد منهم.
+        change يعدل النسخة أو يرجع بدالها، ولو رمى استثناء ما ينحفظ شي.
+        """
+        async with self._lock:
+            await self._reload()
+            data = copy.deepcopy(self._data)
+            result = change(data)
+            if result is not None:
+                data = result
+            await self._write(data)
+            return data
+
+    async def _write(self, data):
+        await asyncio.to_thread(write_json_atomic, self.path, data)
+        old = self._data
+        self._data = data
+        self._stamp = await asyncio.to_thread(_stamp, self.path)
+        self.version += 1
+        self._notify(old, data)
+
+
+class JsonStore:
+    """
+    كل ملفات data/*.json اللي تستخدمها اللوحة، كل ملف له JsonDocument واحد مشترك.
+    """
+
+    def __init__(self, base_dir="data", check_interval=CHECK_INTERVAL):
+        self.base_dir = base_dir
+        self.check_interval = check_interval
+        self._documents = {}
+
+    def document(self, name, default=None):
+        doc = self._documents.get(name)
+        if doc is None:
+            doc = JsonDocument(os.path.join(self.base_dir, name), default, self.check_interval)
+            self._documents[name] = doc
+        return doc
+
+
+class JsonCollection:
+    """
+    عناصر محفوظة في ملف JSON، كل عنصر له id ثابت ما يتغير ولا يرجع ينستخدم بعد الحذف.
+    الملف بالشكل {"next_id": n, "items": {"id": {...}}}، فالبحث والتعديل والحذف بالـ id
+    من الـ dict مباشرة. إذا فيه key (مثل اسم القناة) ينبني له فهرس ثاني للبحث بالاسم.
+    الملفات بالشكل القديم تتحول بـ migrate أول ما تنقرا، وتنحفظ بالشكل الجديد مع أول تعديل.
+    """
+
+    def __init__(self, document, key=None, migrate=None):
+        self.document = document
+        self.key = key
+        self.migrate = migrate
+        self._version = None
+        self._data = None
+        self._by_key = {}
+
+    def _normalize(self, data):
+        if isinstance(data, dict) and isinstance(data.get("items"), dict):
+            return data
+        items = list(self.migrate(data)) if self.migrate and data else []
+        return {
+            "next_id": len(items) + 1,
+            "items": {str(i): item for i, item in enumerate(items, 1)},
+        }
+
+    async def _load(self):
+        data = await self.document.read()
+        if self._version != self.document.version:
+            self._data = self._normalize(data)
+            self._version = self.document.version
+            if self.key:
+                self._by_key = {item.get(self.key): int(i) for i, item in self._data["items"].items()}
+        return self._data
+
+    def items_of(self, data):
+        # عناصر نسخة خام من الملف (مثل اللي توصل لمستمعين الـ document)
+        return [self._with_id(i, item) for i, item in self._normalize(data)["items"].items()]
+
+    @staticmethod
+    def _with_id(item_id, item):
+        return {"id": int(item_id), **item}
+
+    async def all(self):
+        data = await self._load()
+        return [self._with_id(i, item) for i, item in data["items"].items()]
+
+    async def get(self, item_id):
+        item = (await self._load())["items"].get(str(item_id))
+        return self._with_id(item_id, item) if item is not None else None
+
+    async def id_of(self, value):
+        await self._load()
+        return self._by_key.get(value)
+
+    async def add(self, item, replace=False):
+        """
+        يضيف عنصر ويرجع الـ id حقه. إذا فيه عنصر بنفس الـ key: مع replace يتحدث
+        (ويبقى بنفس الـ id)، وبدونه يرمي ValueError.
+        """
+        result = {}
+
+        def change(data):
+            data = self._normalize(data)
+            if self.key:
+                for item_id, existing in data["items"].items():
+                    if existing.get(self.key) == item[self.key]:
+                        if not replace:
+                            raise ValueError("العنصر موجود بالفعل")
+                        existing.update(item)
+                        result["id"] = int(item_id)
+                        return data
+            result["id"] = data["next_id"]
+            data["items"][str(data["next_id"])] = dict(item)
+            data["next_id"] += 1
+            return data
+
+        await self.document.update(change)
+        return result["id"]
+
+    async def update(self, item_id, fields):
+        def change(data):
+            data = self._normalize(data)
+            item = data["items"].get(str(item_id))
+            if item is None:
+                raise KeyError(item_id)
+            item.update(fields)
+            return data
+
+        await self.document.update(change)
+
+    async def delete(self, item_id):
+        def change(data):
+            data = self._normalize(data)
+            if data["items"].pop(str(item_id), None) is None:
+                raise KeyError(item_id)
+            return data
+
+        await self.document.update(change)
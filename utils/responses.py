@@ -1,28 +1,119 @@
 import random
-from settings_manager import BotSettings  # تم تعديل الاستيراد
+import re
+from settings_manager import current_settings
 
-settings = BotSettings()  # تم تعديل الإنشاء
+PLACEHOLDER = re.compile(r"\{(\w+)\}")
 
-def get_response(key: str, context: dict = None) -> str:
+# المتغيرات اللي يرسلها الكود لكل نوع رد، وأي متغير غيرها في الرد ما له قيمة
+RESPONSE_PLACEHOLDERS = {
+    "solo_win_responses": {"player"},
+    "below_50_responses": {"player"},
+    "group_win_responses": {"player"},
+    "team_win_responses": {"team"},
+    "team_lose_responses": {"team"},
+    "team_win": {"team"},
+    "taunts_lose": {"team"},
+    "stolen_responses": {"player"},
+    "kicked_responses": {"player"},
+    "below_zero_responses": {"player"},
+    "doomed_leader_responses": {"leader"},
+    "weak_leader_responses": {"leader"},
+    "taunts_leader": {"leader"},
+}
+
+
+class Template:
     """
-    يرجع رد عشوائي من الردود المخصصة حسب المفتاح المحدد.
-    إذا الرد يحتوي على متغيرات ({player}، {leader}، إلخ) يتم استبدالها من الـ context.
+    رد مجهز مرة وحدة: أجزاء النص الثابتة وأسماء المتغيرات بالترتيب، فالتعبئة
+    تكون join وحدة بدل replace لكل متغير.
     """
-    responses = settings.get_setting("custom_responses") or {}
-    response_data = responses.get(key)
 
-    if not response_data:
-        return "..."
+    __slots__ = ("parts", "slots")
+
+    def __init__(self, text):
+        pieces = PLACEHOLDER.split(text)
+        # split يرجع نص، متغير، نص، ...
+        self.parts = tuple(pieces)
+        self.slots = frozenset(pieces[1::2])
 
-    # إذا كان الرد قائمة → نختار عشوائي
-    if isinstance(response_data, list):
-        selected = random.choice(response_data)
-    else:
-        selected = response_data  # نص مفرد
+    def render(self, context=None):
+        if len(self.parts) == 1:
+            return self.parts[0]
+        context = context or {}
+        out = []
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                out.append(part)
+            elif part in context:
+                out.append(str(context[part]))
+            else:
+                # متغير ما انرسل يبقى مثل ما هو
+                out.append(f"{{{part}}}")
+        return "".join(out)
 
-    # استبدال المتغيرات داخل الرد إذا فيه context
-    if context:
-        for var, value in context.items():
-            selected = selected.replace(f"{{{var}}}", str(value))
 
-    return selected
+def compile_responses(key, response_data):
+    """
+    يجهز ردود مفتاح واحد، ويتجاهل (مع تنبيه) أي رد فيه متغير الكود ما يرسله لهذا المفتاح.
+    """
+    texts = response_data if isinstance(response_data, list) else [response_data]
+    allowed = RESPONSE_PLACEHOLDERS.get(key)
+    templates = []
+    for text in texts:
+        if not isinstance(text, str) or not text:
+            continue
+        template = Template(text)
+        unknown = template.slots - allowed if allowed is not None else None
+        if unknown:
+            print(f"[رد غير صالح] {key}: متغيرات غير معروفة {sorted(unknown)} في: {text}")
+            continue
+        templates.append(template)
+    return tuple(templates)
+
+
+class ResponseCatalog:
+    """
+    الردود المجهزة لكل مفتاح. لما نسخة الإعدادات تتغير، المفاتيح اللي تغيرت ردودها
+    بس ينعاد تجهيزها، والباقي يبقى من الكاش.
+    """
+
+    def __init__(self, settings=current_settings):
+        self.settings = settings
+        self._version = None
+        self._raw = {}
+        self._compiled = {}
+
+    def _refresh(self, snapshot):
+        raw = snapshot.get("custom_responses") or {}
+        for key in [k for k in self._compiled if raw.get(k) != self._raw.get(k)]:
+            del self._compiled[key]
+        self._raw = raw
+        self._version = snapshot.version
+        # نجهز الجديد كله الحين، عشان الردود الغلط تطلع تنبيهاتها وقت التحميل
+        for key, response_data in raw.items():
+            if key not in self._compiled:
+                self._compiled[key] = compile_responses(key, response_data) if response_data else ()
+
+    def templates(self, key):
+        snapshot = self.settings()
+        if snapshot.version != self._version:
+            self._refresh(snapshot)
+        templates = self._compiled.get(key)
+        if templates is None:
+            response_data = self._raw.get(key)
+            templates = compile_responses(key, response_data) if response_data else ()
+            self._compiled[key] = templates
+        return templates
+
+
+catalog = ResponseCatalog()
+
+def get_response(key: str, context: dict = None) -> str:
+    """
+    يرجع رد عشوائي من الردود المخصصة حسب المفتاح المحدد.
+    إذا الرد يحتوي على متغيرات ({player}، {leader}، إلخ) يتم استبدالها من الـ context.
+    """
+    templates = catalog.templates(key)
+    if not templates:
+        return "..."
+    return random.choice(templates).render(context)